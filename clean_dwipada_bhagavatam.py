@@ -15,7 +15,9 @@ Removes:
 Processes files recursively in nested కాండము folders.
 """
 
+import argparse
 import re
+import sys
 from pathlib import Path
 
 DATA_DIR = Path(__file__).parent / "data" / "dwipada_bhagavatam"
@@ -50,6 +52,18 @@ CHARS_TO_REMOVE = [
     '[', ']',       # Brackets
 ]
 
+# Deletes every character in CHARS_TO_REMOVE
+REMOVE_ALL = str.maketrans('', '', ''.join(CHARS_TO_REMOVE))
+# Metadata lines (starting with #) keep their colon
+REMOVE_KEEP_COLON = str.maketrans('', '', ''.join(c for c in CHARS_TO_REMOVE if c != ':'))
+# Characters clean_line looks for; a line with none of them skips the translate
+REMOVE_SET = frozenset(CHARS_TO_REMOVE)
+
+# Runs of spaces left behind by removals
+MULTI_SPACE_RE = re.compile(r' {2,}')
+# Trailing verse numbers (e.g. "... 12")
+TRAILING_NUM_RE = re.compile(r'[0-9]+\s*$')
+
 
 def clean_line(line: str, is_metadata: bool = False) -> str:
     """Clean a single line by removing specified characters.
@@ -58,56 +72,62 @@ def clean_line(line: str, is_metadata: bool = False) -> str:
         line: The line to clean
         is_metadata: If True, preserve colons for metadata format
     """
-    if is_metadata:
-        # For metadata lines (starting with #), only remove specific chars but keep colon
-        chars = [c for c in CHARS_TO_REMOVE if c != ':']
-    else:
-        chars = CHARS_TO_REMOVE
-
-    for char in chars:
-        line = line.replace(char, '')
+    # For metadata lines (starting with #), only remove specific chars but keep colon
+    if not REMOVE_SET.isdisjoint(line):
+        line = line.translate(REMOVE_KEEP_COLON if is_metadata else REMOVE_ALL)
 
     # Remove trailing numbers from verse lines only (not metadata)
     if not is_metadata:
-        line = re.sub(r'[0-9]+\s*$', '', line)
+        line = TRAILING_NUM_RE.sub('', line)
 
     # Clean up multiple spaces that may result from removals
-    line = re.sub(r'  +', ' ', line)
+    line = MULTI_SPACE_RE.sub(' ', line)
 
     return line.strip()
 
 
+def split_line_ending(line: str) -> tuple[str, str]:
+    """Split a line read with newline='' into (text, line ending)."""
+    text = line.rstrip('\r\n')
+    return text, line[len(text):]
+
+
 def clean_file(filepath: Path) -> tuple[int, int]:
     """Clean a single file.
 
     Returns:
         Tuple of (lines_processed, chars_removed)
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_len = len(content)
-
-    lines = content.split('\n')
-    cleaned_lines = []
-
-    for line in lines:
-        # Check if it's a metadata line
-        is_metadata = line.startswith('#')
-        cleaned = clean_line(line, is_metadata)
-        cleaned_lines.append(cleaned)
-
-    cleaned_content = '\n'.join(cleaned_lines)
-    chars_removed = original_len - len(cleaned_content)
-
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(cleaned_content)
-
-    return len(lines), chars_removed
-
-
-def main():
+    # Keep line endings (\n, \r\n or \r) so each is written back as-is
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        lines = f.readlines()
+
+    ending = '\n'
+    # Lines map one-to-one, so the removed count is the sum of per-line deltas
+    chars_removed = 0
+
+    # Stream cleaned lines straight to the file instead of joining them first
+    with open(filepath, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+        for line in lines:
+            line, ending = split_line_ending(line)
+            # Check if it's a metadata line
+            is_metadata = line.startswith('#')
+            cleaned = clean_line(line, is_metadata)
+            f.write(cleaned)
+            f.write(ending)
+            chars_removed += len(line) - len(cleaned)
+
+    # A trailing line ending (or an empty file) leaves an empty last line
+    return len(lines) + (1 if ending else 0), chars_removed
+
+
+def main(argv=None):
     """Clean all files in the dataset (recursively for nested folders)."""
+    parser = argparse.ArgumentParser(description="Clean the dataset in place.")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print the summary, not a line per file")
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print("Cleaning ద్విపద భాగవతము (Dwipada Bhagavatam) Dataset")
     print("=" * 60)
@@ -126,17 +146,20 @@ def main():
     total_lines = 0
     total_chars_removed = 0
 
+    report = []
     current_folder = None
     for filepath in files:
         # Print folder header when entering new folder
         if filepath.parent != current_folder:
             current_folder = filepath.parent
-            print(f"\n  [{current_folder.name}]")
+            report.append(f"\n  [{current_folder.name}]\n")
 
         lines, chars_removed = clean_file(filepath)
         total_lines += lines
         total_chars_removed += chars_removed
-        print(f"    {filepath.name[:45]}... - {chars_removed} chars removed")
+        report.append(f"    {filepath.name[:45]}... - {chars_removed} chars removed\n")
+    if not args.quiet:
+        sys.stdout.write(''.join(report))
 
     print("\n" + "=" * 60)
     print("CLEANING COMPLETE")
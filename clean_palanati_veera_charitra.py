@@ -15,7 +15,13 @@ Removes:
 Processes files in the palanati_veera_charitra folder.
 """
 
+import argparse
+import io
+import mmap
+import os
 import re
+import sys
+from multiprocessing import Pool
 from pathlib import Path
 
 DATA_DIR = Path(__file__).parent / "data" / "palanati_veera_charitra"
@@ -50,6 +56,23 @@ CHARS_TO_REMOVE = [
     '[', ']',       # Brackets
 ]
 
+# Deletes every character in CHARS_TO_REMOVE
+REMOVE_ALL = str.maketrans('', '', ''.join(CHARS_TO_REMOVE))
+# Metadata lines (starting with #) keep their colon
+REMOVE_KEEP_COLON = str.maketrans('', '', ''.join(c for c in CHARS_TO_REMOVE if c != ':'))
+# Characters clean_line looks for; a line with none of them skips the translate
+REMOVE_SET = frozenset(CHARS_TO_REMOVE)
+
+# Runs of spaces left behind by removals
+MULTI_SPACE_RE = re.compile(r' {2,}')
+# Verse lines: space runs and trailing verse numbers (e.g. "... 12") in one pass
+SPACE_OR_TRAILING_NUM_RE = re.compile(r'(?P<sp> {2,})|(?P<num>[0-9]+\s*$)')
+
+
+def _space_or_num(match: re.Match) -> str:
+    """Collapse a space run to one space; drop a trailing number."""
+    return ' ' if match.lastgroup == 'sp' else ''
+
 
 def clean_line(line: str, is_metadata: bool = False) -> str:
     """Clean a single line by removing specified characters.
@@ -58,23 +81,37 @@ def clean_line(line: str, is_metadata: bool = False) -> str:
         line: The line to clean
         is_metadata: If True, preserve colons for metadata format
     """
+    # For metadata lines (starting with #), only remove specific chars but keep colon
+    if not REMOVE_SET.isdisjoint(line):
+        line = line.translate(REMOVE_KEEP_COLON if is_metadata else REMOVE_ALL)
+
     if is_metadata:
-        # For metadata lines (starting with #), only remove specific chars but keep colon
-        chars = [c for c in CHARS_TO_REMOVE if c != ':']
+        # Clean up multiple spaces that may result from removals
+        line = MULTI_SPACE_RE.sub(' ', line)
     else:
-        chars = CHARS_TO_REMOVE
+        # Verse lines also lose trailing numbers (not metadata); same single pass
+        line = SPACE_OR_TRAILING_NUM_RE.sub(_space_or_num, line)
 
-    for char in chars:
-        line = line.replace(char, '')
+    return line.strip()
 
-    # Remove trailing numbers from verse lines only (not metadata)
-    if not is_metadata:
-        line = re.sub(r'[0-9]+\s*$', '', line)
 
-    # Clean up multiple spaces that may result from removals
-    line = re.sub(r'  +', ' ', line)
+def read_text(filepath: Path) -> str:
+    """Read a UTF-8 file through a read-only mmap, decoding straight from the mapping.
 
-    return line.strip()
+    Line endings are returned untranslated.
+    """
+    with open(filepath, 'rb') as f:
+        # Empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return str(mm, 'utf-8')
+
+
+def split_line_ending(line: str) -> tuple[str, str]:
+    """Split a line read with newline='' into (text, line ending)."""
+    text = line.rstrip('\r\n')
+    return text, line[len(text):]
 
 
 def clean_file(filepath: Path) -> tuple[int, int]:
@@ -83,31 +120,45 @@ def clean_file(filepath: Path) -> tuple[int, int]:
     Returns:
         Tuple of (lines_processed, chars_removed)
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    original_len = len(content)
-
-    lines = content.split('\n')
-    cleaned_lines = []
-
-    for line in lines:
-        # Check if it's a metadata line
-        is_metadata = line.startswith('#')
-        cleaned = clean_line(line, is_metadata)
-        cleaned_lines.append(cleaned)
-
-    cleaned_content = '\n'.join(cleaned_lines)
-    chars_removed = original_len - len(cleaned_content)
-
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(cleaned_content)
-
-    return len(lines), chars_removed
-
-
-def main():
+    # Iterate lines with their endings (\n, \r\n or \r) so each is written back as-is
+    lines = io.StringIO(read_text(filepath), newline='')
+    line_count = 0
+    ending = '\n'
+    # Lines map one-to-one, so the removed count is the sum of per-line deltas
+    chars_removed = 0
+
+    # Stream cleaned lines straight to the file instead of joining them first
+    with open(filepath, 'w', encoding='utf-8', newline='', buffering=1 << 20) as f:
+        for line in lines:
+            line, ending = split_line_ending(line)
+            # Check if it's a metadata line
+            is_metadata = line.startswith('#')
+            cleaned = clean_line(line, is_metadata)
+            f.write(cleaned)
+            f.write(ending)
+            chars_removed += len(line) - len(cleaned)
+            line_count += 1
+
+    # A trailing line ending (or an empty file) leaves an empty last line
+    if ending:
+        line_count += 1
+
+    return line_count, chars_removed
+
+
+def _clean_one(filepath: Path) -> tuple[str, int, int]:
+    """Pool worker: clean one file and return (name, lines_processed, chars_removed)."""
+    lines, chars_removed = clean_file(filepath)
+    return filepath.name, lines, chars_removed
+
+
+def main(argv=None):
     """Clean all files in the dataset."""
+    parser = argparse.ArgumentParser(description="Clean the dataset in place.")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print the summary, not a line per file")
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print("Cleaning పల్నాటివీరచరిత్ర (Palanati Veera Charitra) Dataset")
     print("=" * 60)
@@ -126,11 +177,15 @@ def main():
     total_lines = 0
     total_chars_removed = 0
 
-    for filepath in files:
-        lines, chars_removed = clean_file(filepath)
-        total_lines += lines
-        total_chars_removed += chars_removed
-        print(f"  {filepath.name[:50]}... - {chars_removed} chars removed")
+    # _clean_one runs in worker processes; imap yields results in file order
+    report = []
+    with Pool() as pool:
+        for name, lines, chars_removed in pool.imap(_clean_one, files, chunksize=4):
+            total_lines += lines
+            total_chars_removed += chars_removed
+            report.append(f"  {name[:50]}... - {chars_removed} chars removed\n")
+    if not args.quiet:
+        sys.stdout.write(''.join(report))
 
     print("\n" + "=" * 60)
     print("CLEANING COMPLETE")
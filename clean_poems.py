@@ -5,18 +5,22 @@ Clean all poem texts across all datasets:
 2. Preserve # header lines, --- footnotes sections, and .......... gap-markers
 """
 
+import argparse
 import os
-import glob
 import re
+import sys
+from multiprocessing import Pool
 
 # Match lines that are ONLY dots (with optional leading/trailing whitespace)
 DOTLINE = re.compile(r'^\s*\.{3,}\s*$')
 # Match lines that START with dots then have text (e.g. "..........బూజసేసి")
 DOTPREFIX = re.compile(r'^(\.{3,})(.*)')
 # Characters to remove from poem body
-PUNCTUATION = str.maketrans('', '', ':;".!?\u201c\u201d\u2018\u2019\u0c01')
+PUNCTUATION = ':;".!?\u201c\u201d\u2018\u2019\u0c01'
 # [వా.రా. సర్గ ...] references
 SARGA_REF = re.compile(r'\[వా\.రా\.[^\]]*\]')
+# Sarga references and punctuation, removed in one regex pass
+BODY_NOISE = re.compile(SARGA_REF.pattern + '|[' + re.escape(PUNCTUATION) + ']')
 
 
 def clean_body_line(line):
@@ -31,14 +35,10 @@ def clean_body_line(line):
     if m:
         dot_part = m.group(1)
         text_part = m.group(2)
-        text_part = SARGA_REF.sub('', text_part)
-        text_part = text_part.translate(PUNCTUATION)
-        return dot_part + text_part
+        return dot_part + BODY_NOISE.sub('', text_part)
 
     # Regular line: remove sarga refs and punctuation
-    line = SARGA_REF.sub('', line)
-    line = line.translate(PUNCTUATION)
-    return line
+    return BODY_NOISE.sub('', line)
 
 
 def process_file(filepath):
@@ -83,18 +83,50 @@ def process_file(filepath):
         f.write('\n'.join(result) + '\n')
 
 
-def main():
+def _walk_txt(root):
+    """Yield the paths of all .txt files under root, like glob('**/*.txt'), via os.scandir."""
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                # glob skips hidden files and directories
+                if entry.name.startswith('.'):
+                    continue
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.name.endswith('.txt'):
+                    yield entry.path
+
+
+def _process_one(filepath):
+    """Pool worker: clean one file, returning (filepath, error message or None)."""
+    try:
+        process_file(filepath)
+        return filepath, None
+    except Exception as e:
+        return filepath, str(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean all poem texts under data/ in place.")
+    parser.add_argument('-q', '--quiet', action='store_true',
+                        help="only report errors, not every cleaned file")
+    args = parser.parse_args(argv)
+
     data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
-    txt_files = sorted(glob.glob(os.path.join(data_dir, '**', '*.txt'), recursive=True))
+    txt_files = sorted(_walk_txt(data_dir))
 
     print(f"Found {len(txt_files)} files to process")
-    for filepath in txt_files:
-        rel = os.path.relpath(filepath, data_dir)
-        try:
-            process_file(filepath)
-            print(f"  Cleaned: {rel}")
-        except Exception as e:
-            print(f"  ERROR: {rel}: {e}")
+    # _process_one runs in worker processes; imap yields results in file order
+    report = []
+    with Pool() as pool:
+        for filepath, error in pool.imap(_process_one, txt_files, chunksize=4):
+            rel = os.path.relpath(filepath, data_dir)
+            if error is not None:
+                report.append(f"  ERROR: {rel}: {error}\n")
+            elif not args.quiet:
+                report.append(f"  Cleaned: {rel}\n")
+    sys.stdout.write(''.join(report))
 
     print("Done!")
 
@@ -12,8 +12,14 @@ Removes:
 - Other punctuation
 """
 
+import argparse
+import mmap
+import os
 import re
+import sys
+from multiprocessing import Pool
 from pathlib import Path
+from typing import Iterator
 
 DATA_DIR = Path(__file__).parent / "data" / "srirama_parinayamu"
 
@@ -48,6 +54,18 @@ CHARS_TO_REMOVE = [
     '[', ']',       # Brackets
 ]
 
+# Deletes every character in CHARS_TO_REMOVE
+REMOVE_ALL = str.maketrans('', '', ''.join(CHARS_TO_REMOVE))
+# Metadata lines (starting with #) keep their colon
+REMOVE_KEEP_COLON = str.maketrans('', '', ''.join(c for c in CHARS_TO_REMOVE if c != ':'))
+# Characters clean_line looks for; a line with none of them skips the translate
+REMOVE_SET = frozenset(CHARS_TO_REMOVE)
+
+# Runs of spaces left behind by removals
+MULTI_SPACE_RE = re.compile(r' {2,}')
+# Metadata lines (starting with #)
+METADATA_LINE_RE = re.compile(r'^#.*', re.MULTILINE)
+
 
 def clean_line(line: str, is_metadata: bool = False) -> str:
     """Clean a single line by removing specified characters.
@@ -56,51 +74,81 @@ def clean_line(line: str, is_metadata: bool = False) -> str:
         line: The line to clean
         is_metadata: If True, preserve colons for metadata format
     """
-    if is_metadata:
-        # For metadata lines (starting with #), only remove specific chars but keep colon
-        chars = [c for c in CHARS_TO_REMOVE if c != ':']
-    else:
-        chars = CHARS_TO_REMOVE
-
-    for char in chars:
-        line = line.replace(char, '')
+    # For metadata lines (starting with #), only remove specific chars but keep colon
+    if not REMOVE_SET.isdisjoint(line):
+        line = line.translate(REMOVE_KEEP_COLON if is_metadata else REMOVE_ALL)
 
     # Clean up multiple spaces that may result from removals
-    line = re.sub(r'  +', ' ', line)
+    line = MULTI_SPACE_RE.sub(' ', line)
 
     return line
 
 
+def clean_content(content: str) -> Iterator[str]:
+    """Yield the cleaned content in pieces.
+
+    Cleaning is line-local, so the verse text between metadata lines is
+    cleaned as one block; a file without metadata is a single pass.
+    """
+    pos = 0
+    for match in METADATA_LINE_RE.finditer(content):
+        if match.start() > pos:
+            yield clean_line(content[pos:match.start()])
+        yield clean_line(match.group(), is_metadata=True)
+        pos = match.end()
+    if pos < len(content):
+        yield clean_line(content[pos:])
+
+
+def read_text(filepath: Path) -> str:
+    """Read a UTF-8 file through a read-only mmap, decoding straight from the mapping."""
+    with open(filepath, 'rb') as f:
+        # Empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content = str(mm, 'utf-8')
+    # Match text-mode reads: universal newlines
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
 def clean_file(filepath: Path) -> tuple[int, int]:
     """Clean a single file.
 
     Returns:
         Tuple of (lines_processed, chars_removed)
     """
-    with open(filepath, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = read_text(filepath)
 
     original_len = len(content)
+    cleaned_len = 0
 
-    lines = content.split('\n')
-    cleaned_lines = []
+    # Stream cleaned pieces straight to the file instead of joining them first
+    with open(filepath, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        for piece in clean_content(content):
+            f.write(piece)
+            cleaned_len += len(piece)
 
-    for line in lines:
-        # Check if it's a metadata line
-        is_metadata = line.startswith('#')
-        cleaned_lines.append(clean_line(line, is_metadata))
+    chars_removed = original_len - cleaned_len
 
-    cleaned_content = '\n'.join(cleaned_lines)
-    chars_removed = original_len - len(cleaned_content)
+    return content.count('\n') + 1, chars_removed
 
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(cleaned_content)
 
-    return len(lines), chars_removed
+def _clean_one(filepath: Path) -> tuple[str, int, int]:
+    """Pool worker: clean one file and return (name, lines_processed, chars_removed)."""
+    lines, chars_removed = clean_file(filepath)
+    return filepath.name, lines, chars_removed
 
 
-def main():
+def main(argv=None):
     """Clean all files in the dataset."""
+    parser = argparse.ArgumentParser(description="Clean the dataset in place.")
+    parser.add_argument("-q", "--quiet", action="store_true",
+                        help="only print the summary, not a line per file")
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print("Cleaning Sri Rama Parinayamu Dataset")
     print("=" * 60)
@@ -114,11 +162,15 @@ def main():
     total_lines = 0
     total_chars_removed = 0
 
-    for filepath in files:
-        lines, chars_removed = clean_file(filepath)
-        total_lines += lines
-        total_chars_removed += chars_removed
-        print(f"  {filepath.name[:50]}... - {chars_removed} chars removed")
+    # _clean_one runs in worker processes; imap yields results in file order
+    report = []
+    with Pool() as pool:
+        for name, lines, chars_removed in pool.imap(_clean_one, files, chunksize=4):
+            total_lines += lines
+            total_chars_removed += chars_removed
+            report.append(f"  {name[:50]}... - {chars_removed} chars removed\n")
+    if not args.quiet:
+        sys.stdout.write(''.join(report))
 
     print("\n" + "=" * 60)
     print("CLEANING COMPLETE")
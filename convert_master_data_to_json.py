@@ -16,11 +16,18 @@ Each entry contains the couplet text and full provenance metadata.
 """
 
 import json
+import mmap
 import os
 import re
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CONSTANTS
@@ -32,8 +39,9 @@ OUTPUT_FILE = DATA_DIR / "consolidated_dwipada.json"
 # Pattern to match editorial annotations like [వా.రా. సర్గ 5]
 ANNOTATION_PATTERN = re.compile(r"\[.*?\]")
 
-# Pattern to detect damaged/missing text lines
-DOT_PATTERN = re.compile(r"…|\.{4,}")
+# Markers of damaged/missing text lines (an ellipsis, or 4+ dots)
+ELLIPSIS = "…"
+DOT_RUN = "...."
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -64,9 +72,25 @@ def parse_headers(raw_lines: List[str]) -> Dict[str, str]:
     return headers
 
 
-def extract_couplets(filepath: Path) -> Tuple[List[Tuple[str, str]], int, int, int]:
+def read_text(filepath: Path) -> str:
+    """Read a UTF-8 file through a read-only mmap, decoding straight from the mapping."""
+    with open(filepath, "rb") as f:
+        # Empty files cannot be mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            content = str(mm, "utf-8")
+    # Match text-mode reads: universal newlines
+    if "\r" in content:
+        content = content.replace("\r\n", "\n").replace("\r", "\n")
+    return content
+
+
+def extract_couplets(
+    filepath: Path,
+) -> Tuple[List[Tuple[str, str]], int, int, int, Dict[str, str]]:
     """
-    Extract dwipada couplets from a single text file.
+    Extract dwipada couplets and the # headers from a single text file.
 
     Uses blank lines as couplet boundaries:
         - 2 lines between blanks → 1 couplet
@@ -76,33 +100,39 @@ def extract_couplets(filepath: Path) -> Tuple[List[Tuple[str, str]], int, int, i
         - Lines starting with '#' → ignored (heading boundary)
 
     Returns:
-        Tuple of (couplets_list, singleton_count, dot_discarded_count, triplet_count)
+        Tuple of (couplets_list, singleton_count, dot_discarded_count, triplet_count,
+        file_headers)
     """
-    with open(filepath, "r", encoding="utf-8") as f:
-        raw_lines = f.readlines()
+    # Decode and strip the whole file in bulk rather than line by line
+    stripped_lines = list(map(str.strip, read_text(filepath).split("\n")))
+
+    # Headers come from the same read, so the file is opened only once
+    file_headers = parse_headers(stripped_lines)
+
+    # Stop at footnotes section
+    try:
+        del stripped_lines[stripped_lines.index("---"):]
+    except ValueError:
+        pass
 
     # Build groups of consecutive verse lines, split by blank lines and # headings
     groups = []
     current_group = []
 
-    for line in raw_lines:
-        stripped = line.strip()
-
-        # Stop at footnotes section
-        if stripped == "---":
-            break
-
+    for stripped in stripped_lines:
         # Blank lines and # headings end the current group
-        if not stripped or stripped.startswith("#"):
+        if not stripped or stripped[0] == "#":
             if current_group:
                 groups.append(current_group)
                 current_group = []
             continue
 
-        # Strip editorial annotations
-        cleaned = ANNOTATION_PATTERN.sub("", stripped).strip()
-        if cleaned:
-            current_group.append(cleaned)
+        # Strip editorial annotations (only lines that can contain one)
+        if "[" in stripped:
+            stripped = ANNOTATION_PATTERN.sub("", stripped).strip()
+            if not stripped:
+                continue
+        current_group.append(stripped)
 
     # Flush last group
     if current_group:
@@ -119,22 +149,36 @@ def extract_couplets(filepath: Path) -> Tuple[List[Tuple[str, str]], int, int, i
             singleton_count += 1
         elif len(group) == 2:
             line1, line2 = group
-            if DOT_PATTERN.search(line1) or DOT_PATTERN.search(line2):
+            if (ELLIPSIS in line1 or DOT_RUN in line1
+                    or ELLIPSIS in line2 or DOT_RUN in line2):
                 dot_discarded += 1
             else:
                 valid_couplets.append((line1, line2))
         elif len(group) >= 3:
             if len(group) == 3:
                 triplet_count += 1
+            # Screen each line once; overlapping windows share their lines
+            damaged = [ELLIPSIS in line or DOT_RUN in line for line in group]
             # Overlapping sliding window: (1,2), (2,3), ...
             for i in range(len(group) - 1):
-                l1, l2 = group[i], group[i + 1]
-                if DOT_PATTERN.search(l1) or DOT_PATTERN.search(l2):
+                if damaged[i] or damaged[i + 1]:
                     dot_discarded += 1
                 else:
-                    valid_couplets.append((l1, l2))
+                    valid_couplets.append((group[i], group[i + 1]))
 
-    return valid_couplets, singleton_count, dot_discarded, triplet_count
+    return valid_couplets, singleton_count, dot_discarded, triplet_count, file_headers
+
+
+def walk_txt(root: Path) -> Iterator[str]:
+    """Yield the paths of all .txt files under root, like rglob("*.txt"), via os.scandir."""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    stack.append(entry.path)
+                elif entry.name.endswith(".txt"):
+                    yield entry.path
 
 
 def get_work_name(filepath: Path, data_dir: Path) -> str:
@@ -143,36 +187,45 @@ def get_work_name(filepath: Path, data_dir: Path) -> str:
     return relative.parts[0] if relative.parts else "unknown"
 
 
-def get_file_headers(filepath: Path) -> Dict[str, str]:
-    """Read and parse the # headers from a file."""
-    with open(filepath, "r", encoding="utf-8") as f:
-        raw_lines = f.readlines()
-    return parse_headers(raw_lines)
+def build_source(source_file: str, work: str,
+                 file_headers: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Build the provenance dict shared by every couplet of a file.
 
+    build_entry copies it and fills in couplet_number, which is already
+    present here so the key order of the output is unchanged.
 
-def build_entry(line1: str, line2: str, source_file: str, work: str,
-                couplet_idx: int, file_headers: Dict[str, str]) -> Dict[str, Any]:
+    Args:
+        source_file: Relative path to the source .txt file
+        work: Name of the literary work (top-level folder under data/)
+        file_headers: Parsed # headers from the source file
+    """
+    return {
+        "work": work,
+        "file": source_file,
+        "couplet_number": None,
+        **file_headers,
+    }
+
+
+def build_entry(line1: str, line2: str, couplet_idx: int,
+                file_source: Dict[str, Any]) -> Dict[str, Any]:
     """
     Build a single JSON entry for a couplet.
 
     Args:
         line1: First line of the couplet
         line2: Second line of the couplet
-        source_file: Relative path to the source .txt file
-        work: Name of the literary work (top-level folder under data/)
         couplet_idx: Couplet index within the file (1-based)
-        file_headers: Parsed # headers from the source file
+        file_source: Provenance dict for the file, from build_source()
     """
+    source = file_source.copy()
+    source["couplet_number"] = couplet_idx
     return {
         "poem": f"{line1}\n{line2}",
         "line1": line1,
         "line2": line2,
-        "source": {
-            "work": work,
-            "file": source_file,
-            "couplet_number": couplet_idx,
-            **file_headers,
-        },
+        "source": source,
     }
 
 
@@ -182,7 +235,7 @@ def main():
         sys.exit(1)
 
     # Find all text files (sorted for deterministic order)
-    txt_files = sorted(DATA_DIR.rglob("*.txt"))
+    txt_files = [Path(p) for p in sorted(walk_txt(DATA_DIR), key=lambda p: p.split(os.sep))]
     print(f"Found {len(txt_files)} .txt files in {DATA_DIR}/")
 
     # Process all files
@@ -192,13 +245,13 @@ def main():
     total_triplets = 0
 
     for filepath in txt_files:
-        couplets, singletons, dot_discarded, triplets = extract_couplets(filepath)
+        couplets, singletons, dot_discarded, triplets, file_headers = extract_couplets(filepath)
         work = get_work_name(filepath, DATA_DIR)
         source = str(filepath.relative_to(DATA_DIR))
-        file_headers = get_file_headers(filepath)
+        file_source = build_source(source, work, file_headers)
 
         for idx, (line1, line2) in enumerate(couplets, start=1):
-            entry = build_entry(line1, line2, source, work, idx, file_headers)
+            entry = build_entry(line1, line2, idx, file_source)
             all_entries.append(entry)
 
         total_singletons += singletons
@@ -206,8 +259,13 @@ def main():
         total_triplets += triplets
 
     # Write consolidated JSON
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        json.dump(all_entries, f, ensure_ascii=False, indent=2)
+    if HAS_ORJSON:
+        # Same bytes as json.dump(..., ensure_ascii=False, indent=2), encoded in C
+        with open(OUTPUT_FILE, "wb") as f:
+            f.write(orjson.dumps(all_entries, option=orjson.OPT_INDENT_2))
+    else:
+        with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
+            json.dump(all_entries, f, ensure_ascii=False, indent=2)
 
     # Summary
     print(f"\n{'=' * 60}")
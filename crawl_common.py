@@ -0,0 +1,379 @@
+"""
+Shared helpers for the Telugu Wikisource (te.wikisource.org) crawlers; the
+Palanati blog crawler uses the session and parsing helpers too, and the
+Ranganatha Ramayanam crawler the request throttle.
+
+Fetching goes through one pooled, retrying requests session, so crawlers run
+in the same process share its connections. Pages are read as plain lxml
+trees: the text under a content div is split at heading elements in a
+single walk, then cleaned up with clean_text.
+"""
+
+import re
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+from typing import List
+import warnings
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+
+# Suppress SSL warnings
+warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+
+# Request settings
+TIMEOUT = 60
+# Retries for connection errors and 429/5xx responses, with exponential
+# backoff: 3 attempts in all, as the crawlers' own retry loops made
+RETRIES = 2
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Pages fetched at once
+FETCH_WORKERS = 4
+# Bytes read from a response at a time, and fed to the parser
+FETCH_CHUNK_SIZE = 64 * 1024
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+}
+
+
+def make_session(verify: bool = False) -> requests.Session:
+    """HTTP session that keeps connections alive and retries failed requests.
+
+    Certificates are not verified unless verify is set (Wikisource's fails).
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    session.verify = verify
+    retry = Retry(total=RETRIES, backoff_factor=1, status_forcelist=RETRY_STATUSES)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# One pooled session for every fetch, so later requests skip the TLS handshake
+SESSION = make_session()
+
+# Text cleanup patterns, compiled once
+CITATION_RE = re.compile(r'\[\d+\]')
+# A page number at the end of a (stripped) line
+LINE_TRAILING_NUM_RE = re.compile(r'\s+\d+$')
+# Deletion table for invalid filename characters, and runs of whitespace
+INVALID_FILENAME_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def has_class(name: str) -> str:
+    """XPath predicate matching an element whose class list contains name (like bs4's class_=)."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Main content area: the first matching div in the page
+PARSER_OUTPUT_XPATH = etree.XPath(f"(//div[{has_class('mw-parser-output')}])[1]")
+PAGES_OUTPUT_XPATH = etree.XPath(f"(//div[{has_class('prp-pages-output')}])[1]")
+# Centered tiInherit divs (title candidates), in document order; the style
+# test runs inside the compiled query instead of per div in Python
+CENTERED_TI_INHERIT_XPATH = etree.XPath(
+    f".//div[{has_class('tiInherit')}]"
+    "[contains(@style, 'text-align:center') or contains(@style, 'text-align: center')]"
+)
+
+# Text anywhere inside these is not page text (bs4's get_text() skips it too)
+NON_TEXT_TAGS = frozenset(['style', 'script', 'template', 'rt', 'rp'])
+# Whitespace as bs4 sees it: it reads a text node of only these characters
+# as a single newline (if it has one) or a single space
+ASCII_SPACES = ' \n\t\f\r'
+
+
+def fetch_page(url: str, session: requests.Session = SESSION, timeout: float = TIMEOUT):
+    """Fetch a page (by default through SESSION, with SSL verification
+    disabled) and parse it as it downloads; timeout is in seconds.
+
+    The body is fed to an lxml HTML parser chunk by chunk, so parsing
+    overlaps the download and the whole page is never held as bytes or str.
+
+    Returns:
+        The root element of the page, or None if it could not be fetched
+    """
+    # Wikisource and blog pages are UTF-8, whatever the bytes claim
+    parser = etree.HTMLParser(encoding='utf-8')
+    try:
+        with session.get(url, timeout=timeout, stream=True) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+                parser.feed(chunk)
+        # An empty body has no root element
+        return parser.close()
+    except (requests.RequestException, etree.XMLSyntaxError) as e:
+        print(f"  ERROR: Failed to fetch {url}: {e}")
+        return None
+
+
+class RequestThrottle:
+    """Space out the start of requests made from any thread by a fixed interval."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.lock = threading.Lock()
+        self.next_start = 0.0
+
+    def wait(self):
+        with self.lock:
+            now = time.monotonic()
+            delay = self.next_start - now
+            self.next_start = max(now, self.next_start) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+def fetch_pages(urls: List[str]) -> list:
+    """Fetch and parse several pages concurrently; results are in the order of urls."""
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        return list(pool.map(fetch_page, urls))
+
+
+def clean_text(text: str) -> str:
+    """Clean extracted text by removing extra whitespace and citations.
+
+    A single pass over the lines drops page numbers, joins words split by a
+    page-break hyphen and collapses runs of blank lines, with the same result
+    as applying those rules as whole-text regex substitutions in turn.
+    """
+    # Remove citation markers [1], [2], etc.
+    lines = CITATION_RE.sub('', text).split('\n')
+
+    out = []
+    # Blank lines since the last kept line: True if empty, False if only whitespace
+    blanks = []
+    # A page number consumes the blank lines after it
+    skip_blanks = False
+
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if not stripped:
+            if not skip_blanks:
+                blanks.append(not line)
+            continue
+
+        # A line holding only a page number disappears, with the blank lines
+        # around it (the first line needs whitespace before the number)
+        if stripped.isdecimal() and (i or line[0].isspace()):
+            blanks = []
+            skip_blanks = True
+            continue
+
+        # Remove a standalone number at the line end (page numbers)
+        match = stripped[-1].isdecimal() and LINE_TRAILING_NUM_RE.search(stripped)
+        if match:
+            stripped = stripped[:match.start()]
+        skip_blanks = bool(match)
+
+        if out and out[-1].endswith('-'):
+            # Remove hyphens from page breaks, with the blank lines after them
+            out[-1] = out[-1][:-1] + stripped
+        else:
+            if out and blanks:
+                # Runs of empty lines collapse to one (keep max 2 newlines)
+                out.extend('' for empty, prev in zip(blanks, [False] + blanks)
+                           if not (empty and prev))
+            out.append(stripped)
+        blanks = []
+
+    # A hyphen on the last line is only a page break if a newline follows it
+    if out and blanks and out[-1].endswith('-'):
+        out[-1] = out[-1][:-1].rstrip()
+        # Remove empty lines at the end
+        while out and not out[-1]:
+            out.pop()
+
+    return '\n'.join(out)
+
+
+def text_node(text: str) -> str:
+    """A text node as bs4 keeps it: whitespace-only text collapses."""
+    if text.strip(ASCII_SPACES):
+        return text
+    return '\n' if '\n' in text else ' '
+
+
+def element_strings(el):
+    """Yield the text nodes under an element, like the strings bs4's get_text() joins."""
+    if el.text:
+        yield el.text
+    for child in el:
+        # Comments have a non-string tag; for them and NON_TEXT_TAGS only the tail is text
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS:
+            yield from element_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def heading_title(el) -> str:
+    """An element's text with each string stripped, like bs4's get_text(strip=True)."""
+    return ''.join(s.strip() for s in element_strings(el))
+
+
+# Spans that hold no page text by default: page number markers
+PAGENUM_SPAN_CLASSES = frozenset(['pagenum'])
+
+
+def is_removed(el, span_classes=PAGENUM_SPAN_CLASSES) -> bool:
+    """Page number markers (spans with one of span_classes), footnote
+    superscripts and ws-noexport elements (navigation, metadata) are not
+    page text."""
+    # Most elements have no class at all; skip the split for them
+    classes = el.get('class')
+    if not classes:
+        return False
+    classes = classes.split()
+    if 'ws-noexport' in classes:
+        return True
+    if el.tag == 'span':
+        return not span_classes.isdisjoint(classes)
+    return el.tag == 'sup' and 'reference' in classes
+
+
+class SectionText:
+    """Text of one section, gathered as extract_section_content reads it."""
+
+    __slots__ = ('poems', 'paras', 'chunks', 'started')
+
+    def __init__(self):
+        self.poems = []   # one chunk list per poem div
+        self.paras = []   # one chunk list per <p> outside a poem
+        self.chunks = []  # all text, for pages without either
+        self.started = False
+
+
+class SectionSplitter:
+    """Split the text under a content div at section headings in one pass.
+
+    The text after a heading reads as if the HTML between it and the next
+    heading were parsed on its own: elements opened before the heading (its
+    ancestors) no longer contain that text, and whitespace before the first
+    element or text of a section is dropped, as the parser does at the start
+    of a document.
+
+    Spans with one of removed_span_classes are dropped along with the other
+    elements is_removed matches.
+    """
+
+    def __init__(self, headings, removed_span_classes=PAGENUM_SPAN_CLASSES):
+        self.headings = set(headings)
+        self.removed_span_classes = removed_span_classes
+        self.sections = []
+        self.section = None
+        # State of the elements opened since the current section started:
+        # how many are removed, and the open poem / <p> text parts
+        self.removed = 0
+        self.poems = []
+        self.paras = []
+
+    def start_section(self):
+        self.section = SectionText()
+        self.sections.append(self.section)
+        # Elements still open were opened before the heading
+        self.removed = 0
+        self.poems = []
+        self.paras = []
+
+    def emit(self, chunk: str):
+        section = self.section
+        if section is None:
+            return
+        if not section.started:
+            chunk = chunk.lstrip(' \t\n\r')
+            if not chunk:
+                return
+            section.started = True
+        if self.removed:
+            return
+        section.chunks.append(chunk)
+        # Text inside a poem belongs to the poem (and to every poem around it)
+        for part in self.poems or self.paras:
+            part.append(chunk)
+
+    def walk(self, el):
+        if el in self.headings:
+            # Heading text is the title, not content
+            self.start_section()
+            return
+
+        section = self.section
+        tag = el.tag
+        # Text inside NON_TEXT_TAGS is dropped like that of removed elements
+        removed = is_removed(el, self.removed_span_classes) or tag in NON_TEXT_TAGS
+        poem = para = None
+        if section is not None:
+            if tag != 'style' and tag != 'script':
+                section.started = True
+            if removed:
+                self.removed += 1
+            elif not self.removed:
+                if tag == 'div' and 'poem' in el.get('class', '').split():
+                    poem = []
+                    section.poems.append(poem)
+                    self.poems.append(poem)
+                elif tag == 'p' and not self.poems:
+                    para = []
+                    section.paras.append(para)
+                    self.paras.append(para)
+
+        if tag == 'br':
+            self.emit('\n')
+        elif tag not in NON_TEXT_TAGS and el.text:
+            self.emit(text_node(el.text))
+        for child in el:
+            if isinstance(child.tag, str):
+                self.walk(child)
+            if child.tail:
+                self.emit(text_node(child.tail))
+
+        # A heading inside this element has already reset the state
+        if section is not None and self.section is section:
+            if removed:
+                self.removed -= 1
+            if poem is not None:
+                self.poems.pop()
+            if para is not None:
+                self.paras.pop()
+
+    def split(self, content_div) -> List[SectionText]:
+        self.walk(content_div)
+        return self.sections
+
+
+def extract_section_content(section: SectionText) -> str:
+    """Extract clean text content from a section's text."""
+    # Collect text from multiple sources: poem divs, then direct <p> tags.
+    # The splitter already left <p>s inside poems out of section.paras.
+    all_text_parts = []
+    for part in chain(section.poems, section.paras):
+        part_text = ''.join(part)
+        # Same test as part_text.strip(), without copying the text
+        if part_text and not part_text.isspace():
+            all_text_parts.append(part_text)
+
+    if all_text_parts:
+        text = '\n'.join(all_text_parts)
+    else:
+        # Ultimate fallback: get all text
+        text = ''.join(section.chunks)
+
+    # Clean up
+    text = clean_text(text)
+
+    return text
+
+
+def sanitize_filename(name: str) -> str:
+    """Sanitize a string for use as a filename."""
+    # Remove or replace invalid filename characters
+    sanitized = name.translate(INVALID_FILENAME_CHARS)
+    # Replace multiple spaces with single space
+    sanitized = WHITESPACE_RE.sub(' ', sanitized)
+    # Limit length
+    return sanitized[:50].strip() if len(sanitized) > 50 else sanitized.strip()
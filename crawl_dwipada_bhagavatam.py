@@ -8,14 +8,13 @@ and saves one file per kanda.
 
 import os
 import re
-import requests
-from bs4 import BeautifulSoup
 from pathlib import Path
 from typing import List, Tuple, Optional
-import warnings
 
-# Suppress SSL warnings
-warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+from crawl_common import (
+    NON_TEXT_TAGS, PARSER_OUTPUT_XPATH, PAGES_OUTPUT_XPATH,
+    fetch_pages, is_removed,
+)
 
 # Configuration
 BASE_URL = "https://te.wikisource.org/wiki/ద్విపదభాగవతము/"
@@ -43,23 +42,17 @@ KANDAS = [
 
 OUTPUT_DIR = Path(__file__).parent / "data" / "dwipada_bhagavatam2"
 
-# Request settings
-TIMEOUT = 60
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-}
-
-
-def fetch_page(url: str) -> Optional[str]:
-    """Fetch HTML content from a URL with SSL verification disabled."""
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=TIMEOUT, verify=False)
-        response.raise_for_status()
-        response.encoding = 'utf-8'
-        return response.text
-    except requests.RequestException as e:
-        print(f"  ERROR: Failed to fetch {url}: {e}")
-        return None
+# Verse cleanup patterns, compiled once
+ELLIPSIS_LINE_RE = re.compile(r'^[\.…\s]+$')
+FOOTNOTE_RE = re.compile(r'\[\d+\]')
+TRAILING_NUM_RE = re.compile(r'\d{1,3}\s*$')
+# Deletion tables: quotation marks, exclamation marks, semicolons, commas,
+# and for verse lines parentheses too
+PUNCT_CHARS = '"\u201c\u201d!;,'
+HEADING_PUNCT_TABLE = str.maketrans('', '', PUNCT_CHARS)
+VERSE_PUNCT_TABLE = str.maketrans('', '', PUNCT_CHARS + '()')
+# Runs of blank lines in a heading
+EXCESS_NEWLINES_RE = re.compile(r'\n{4,}')
 
 
 def clean_verse_line(line: str) -> Optional[str]:
@@ -71,26 +64,26 @@ def clean_verse_line(line: str) -> Optional[str]:
     if not line:
         return None
 
-    # Skip ellipsis-only lines
-    if re.match(r'^[\.…\s]+$', line):
+    # Skip ellipsis-only lines (the line is stripped, so one starts with a dot)
+    if line[0] in '.…' and ELLIPSIS_LINE_RE.match(line):
         return None
 
     # Remove footnote markers like [1], [2]
-    line = re.sub(r'\[\d+\]', '', line)
+    if '[' in line:
+        line = FOOTNOTE_RE.sub('', line)
 
-    # Remove parentheses but keep the text inside: (text) -> text
-    line = re.sub(r'\(([^)]*)\)', r'\1', line)
-    # Remove any remaining unmatched parens
-    line = line.replace('(', '').replace(')', '')
-    # Remove quotation marks, exclamation marks, semicolons, commas
-    line = re.sub(r'["""\u201c\u201d!;,]', '', line)
+    # Remove parentheses but keep the text inside: (text) -> text; unmatched
+    # parens go too. Remove quotation marks, exclamation marks, semicolons,
+    # commas in the same pass.
+    line = line.translate(VERSE_PUNCT_TABLE)
 
     # Remove trailing page numbers (e.g. "text 10", "text;20")
     # These are page markers from the print edition, typically multiples of 10
-    line = re.sub(r'\d{1,3}\s*$', '', line)
+    if line.rstrip()[-1:].isdecimal():
+        line = TRAILING_NUM_RE.sub('', line)
 
     # Clean up extra spaces
-    line = re.sub(r'\s+', ' ', line).strip()
+    line = ' '.join(line.split())
 
     if not line:
         return None
@@ -98,74 +91,123 @@ def clean_verse_line(line: str) -> Optional[str]:
     return line
 
 
+def clean_verse_lines(lines: List[str]) -> List[str]:
+    """Clean verse lines, dropping the ones to skip."""
+    return [result for result in map(clean_verse_line, lines) if result]
+
+
+def join_couplets(cleaned: List[str]) -> str:
+    """Join cleaned verse lines as couplets (pairs of 2 lines with blank line
+    between); an odd line at the end stands alone."""
+    lines = iter(cleaned)
+    couplets = list(map("\n".join, zip(lines, lines)))
+    if len(cleaned) % 2:
+        couplets.append(cleaned[-1])
+    return "\n\n".join(couplets)
+
+
 def format_couplets(lines: List[str]) -> str:
     """Format verse lines as couplets (pairs of 2 lines with blank line between)."""
-    # Clean all lines, filtering out None
-    cleaned = []
-    for line in lines:
-        result = clean_verse_line(line)
-        if result:
-            cleaned.append(result)
-
-    if not cleaned:
-        return ""
-
-    # Group into pairs (couplets)
-    couplets = []
-    for i in range(0, len(cleaned), 2):
-        if i + 1 < len(cleaned):
-            couplets.append(f"{cleaned[i]}\n{cleaned[i+1]}")
-        else:
-            # Odd line at the end - include it standalone
-            couplets.append(cleaned[i])
+    return join_couplets(clean_verse_lines(lines))
 
-    return "\n\n".join(couplets)
 
+def has_class_token(el, name: str) -> bool:
+    """Whether an element's class list contains name."""
+    # A substring test on the raw attribute rules out most elements without
+    # splitting it; the split keeps "tiInheritX" from counting as "tiInherit"
+    classes = el.get('class')
+    return classes is not None and name in classes and name in classes.split()
 
-def parse_kanda_page(html: str) -> List[Tuple[str, str]]:
-    """Parse a kanda page and extract headings and verse blocks.
+
+def kept_descendants(el):
+    """Yield the descendant elements of el in document order, skipping removed subtrees."""
+    for child in el:
+        # Comments have a non-string tag
+        if isinstance(child.tag, str) and not is_removed(child):
+            yield child
+            yield from kept_descendants(child)
+
+
+def collect_poems(el, poems: list) -> bool:
+    """Append the poem divs under el to poems, in document order, as
+    [poem, has_headings] pairs; has_headings tells whether the poem holds a
+    tiInherit heading div.
+
+    One walk covers the whole content div, nested poems included; removed
+    subtrees are skipped.
 
     Returns:
-        List of (type, text) tuples where type is "heading" or "verses"
+        True if el holds a tiInherit heading div
     """
-    soup = BeautifulSoup(html, 'lxml')
+    has_headings = False
+    for child in el:
+        # Comments have a non-string tag
+        if not isinstance(child.tag, str) or is_removed(child):
+            continue
+        if child.tag == 'div':
+            classes = child.get('class', '').split()
+            if 'tiInherit' in classes:
+                has_headings = True
+            if 'poem' in classes:
+                entry = [child, False]
+                poems.append(entry)
+                entry[1] = collect_poems(child, poems)
+                has_headings = has_headings or entry[1]
+                continue
+        if collect_poems(child, poems):
+            has_headings = True
+    return has_headings
+
+
+def poem_strings(el):
+    """Yield the text nodes under an element, like the strings bs4's get_text()
+    joins once each <br> is replaced by a newline and removed elements are gone."""
+    if el.tag == 'br':
+        yield '\n'
+    elif el.text:
+        yield el.text
+    for child in el:
+        # For comments, removed elements and NON_TEXT_TAGS only the tail is text
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS and not is_removed(child):
+            yield from poem_strings(child)
+        if child.tail:
+            yield child.tail
+
+
+def text_lines(text: str) -> List[str]:
+    """The non-blank lines of a text, stripped (clean_verse_line strips them anyway)."""
+    return [l for l in map(str.strip, text.split('\n')) if l]
+
+
+def parse_kanda_page(tree) -> List[Tuple[str, str]]:
+    """Extract headings and verse blocks from a parsed kanda page.
+
+    The page's plain lxml elements (see fetch_page) are read without
+    modifying the tree; page numbers, footnotes and ws-noexport elements are
+    skipped as the text is gathered.
 
+    Returns:
+        List of (type, text) tuples where type is "heading" or "verses"
+    """
     # Find main content area
-    content_div = soup.find('div', class_='prp-pages-output')
-    if not content_div:
-        content_div = soup.find('div', class_='mw-parser-output')
+    content_div = PAGES_OUTPUT_XPATH(tree) or PARSER_OUTPUT_XPATH(tree)
 
     if not content_div:
         print("  WARNING: Could not find main content div")
         return []
-
-    # Remove page number markers
-    for pagenum in content_div.find_all('span', class_='pagenum'):
-        pagenum.decompose()
-
-    # Remove footnote superscripts
-    for sup in content_div.find_all('sup', class_='reference'):
-        sup.decompose()
-
-    # Remove ws-noexport elements
-    for noexport in content_div.find_all(class_='ws-noexport'):
-        noexport.decompose()
+    content_div = content_div[0]
 
     result = []
 
     # Process poem divs - they contain both headings and verses
-    poems = content_div.find_all('div', class_='poem')
-
-    for poem in poems:
-        # Check for embedded heading(s) inside the poem
-        headings_in_poem = poem.find_all('div', class_='tiInherit')
+    poems = []
+    collect_poems(content_div, poems)
 
-        if not headings_in_poem:
+    for poem, has_headings in poems:
+        # Poems with embedded heading(s) are read child by child
+        if not has_headings:
             # No headings - the whole poem is verse content
-            for br in poem.find_all('br'):
-                br.replace_with('\n')
-            text = poem.get_text()
-            lines = [l for l in text.split('\n') if l.strip()]
+            lines = text_lines(''.join(poem_strings(poem)))
             if lines:
                 result.append(("verses", lines))
         else:
@@ -181,38 +223,33 @@ def parse_kanda_page(html: str) -> List[Tuple[str, str]]:
 
 def _extract_from_poem_with_headings(poem, result: list):
     """Extract headings and verses from a poem div that contains tiInherit headings."""
-    # Get all the text content, identifying heading positions
-    # Strategy: iterate through children of the poem
-
-    # First, replace <br> with newlines
-    for br in poem.find_all('br'):
-        br.replace_with('\n')
-
+    # Strategy: iterate through the poem's children - elements and the text
+    # between them - each giving its own lines
     current_verses = []
+    if poem.text:
+        current_verses.extend(text_lines(poem.text))
 
-    for child in poem.children:
-        if hasattr(child, 'get') and child.get('class') and 'tiInherit' in child.get('class', []):
+    for child in poem:
+        if not isinstance(child.tag, str) or is_removed(child):
+            pass
+        elif has_class_token(child, 'tiInherit'):
             # This is a heading
             # First, flush any accumulated verses
             if current_verses:
                 result.append(("verses", current_verses))
                 current_verses = []
 
-            bold = child.find('b')
-            if bold:
-                heading_text = bold.get_text(strip=True)
+            bold = next((el for el in kept_descendants(child) if el.tag == 'b'), None)
+            # A <b> inside ruby text or a template has no page text
+            if bold is not None and next(bold.iterancestors(*NON_TEXT_TAGS), None) is None:
+                heading_text = ''.join(s.strip() for s in poem_strings(bold))
                 # Skip the kanda title itself (e.g. "ద్విపదభాగవతము")
                 if heading_text and 'ద్విపదభాగవతము' not in heading_text:
                     result.append(("heading", heading_text))
-        elif hasattr(child, 'get_text'):
-            text = child.get_text()
-            lines = [l for l in text.split('\n') if l.strip()]
-            current_verses.extend(lines)
-        elif isinstance(child, str):
-            text = child.strip()
-            if text:
-                lines = [l for l in text.split('\n') if l.strip()]
-                current_verses.extend(lines)
+        else:
+            current_verses.extend(text_lines(''.join(poem_strings(child))))
+        if child.tail:
+            current_verses.extend(text_lines(child.tail))
 
     # Flush remaining verses
     if current_verses:
@@ -220,27 +257,42 @@ def _extract_from_poem_with_headings(poem, result: list):
 
 
 def build_output(parsed: List[Tuple[str, str]]) -> str:
-    """Build the final output string from parsed headings and verse blocks."""
-    output_parts = []
+    """Build the final output string from parsed headings and verse blocks.
+
+    The pieces of every block, with one line break between blocks, go into
+    one list that is joined once at the end. Blocks neither start nor end
+    with a line break, so no more than three ever run together between them
+    and the joined text needs no blank-line cleanup pass.
+    """
+    parts = []
 
     for item_type, content in parsed:
         if item_type == "heading":
             # Clean punctuation from headings too
-            clean_heading = re.sub(r'["""\u201c\u201d!;,]', '', content).strip()
-            output_parts.append(f"\n# {clean_heading}\n")
+            clean_heading = content.translate(HEADING_PUNCT_TABLE).strip()
+            # Only a heading's own text can hold a longer run of line breaks
+            if '\n' in clean_heading:
+                clean_heading = EXCESS_NEWLINES_RE.sub('\n\n\n', clean_heading)
+            if parts:
+                parts.append("\n")
+            parts += ("\n# ", clean_heading, "\n")
         elif item_type == "verses":
-            formatted = format_couplets(content)
-            if formatted:
-                output_parts.append(formatted)
+            cleaned = clean_verse_lines(content)
+            if cleaned:
+                if parts:
+                    parts.append("\n")
+                parts.append(join_couplets(cleaned))
 
-    # Join and clean up excessive blank lines
-    text = "\n".join(output_parts)
-    text = re.sub(r'\n{4,}', '\n\n\n', text)
-    return text.strip() + "\n"
+    return "".join(parts).strip() + "\n"
 
 
-def crawl_kanda(kanda: dict, output_dir: Path) -> bool:
-    """Crawl a kanda and save as a single file.
+def kanda_url(kanda: dict) -> str:
+    """Wikisource URL of a kanda page."""
+    return BASE_URL + kanda['url_slug']
+
+
+def crawl_kanda(kanda: dict, output_dir: Path, tree) -> bool:
+    """Parse a kanda page, already fetched, and save as a single file.
 
     Returns:
         True if successful
@@ -249,18 +301,14 @@ def crawl_kanda(kanda: dict, output_dir: Path) -> bool:
     print(f"Crawling {kanda['name']} ({kanda['telugu']})")
     print(f"{'='*60}")
 
-    # Build URL
-    url = BASE_URL + kanda['url_slug']
-    print(f"  URL: {url}")
+    print(f"  URL: {kanda_url(kanda)}")
 
-    # Fetch the page
-    html = fetch_page(url)
-    if not html:
+    if tree is None:
         print(f"  ERROR: Failed to fetch kanda page")
         return False
 
     # Parse headings and verses
-    parsed = parse_kanda_page(html)
+    parsed = parse_kanda_page(tree)
 
     heading_count = sum(1 for t, _ in parsed if t == "heading")
     verse_count = sum(1 for t, _ in parsed if t == "verses")
@@ -275,8 +323,7 @@ def crawl_kanda(kanda: dict, output_dir: Path) -> bool:
 
     # Save to file
     filepath = output_dir / kanda['filename']
-    with open(filepath, 'w', encoding='utf-8') as f:
-        f.write(output_text)
+    filepath.write_bytes(output_text.encode('utf-8'))
 
     line_count = output_text.count('\n')
     print(f"  Saved: {filepath} ({line_count} lines)")
@@ -298,8 +345,11 @@ def main():
     # Track statistics
     success_count = 0
 
-    for kanda in KANDAS:
-        if crawl_kanda(kanda, OUTPUT_DIR):
+    # Fetch all pages concurrently up front; parsing and saving stay in order
+    pages = fetch_pages([kanda_url(kanda) for kanda in KANDAS])
+
+    for kanda, tree in zip(KANDAS, pages):
+        if crawl_kanda(kanda, OUTPUT_DIR, tree):
             success_count += 1
 
     # Final summary
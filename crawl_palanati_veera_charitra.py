@@ -13,14 +13,18 @@ Key features:
 
 import os
 import re
-import requests
-from bs4 import BeautifulSoup, NavigableString
+from lxml import etree
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import List, Tuple
 import warnings
-import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 
+from crawl_common import (
+    NON_TEXT_TAGS, RequestThrottle, fetch_page, has_class, make_session,
+    sanitize_filename, text_node,
+)
+
 # Suppress SSL warnings
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 
@@ -28,54 +32,134 @@ warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 BASE_URL = "https://sahityasourabham.blogspot.com/search?q="
 SEARCH_QUERY_TEMPLATE = 'శ్రీనాధభట్టకృత " పల్నాటివీరచరిత్ర " -- ద్విపదకావ్యం - {}'
 TOTAL_PAGES = 33
+# Search URL up to the page number; percent-encoding works character by
+# character, so the query is only encoded once
+PAGE_URL_PREFIX = BASE_URL + quote(SEARCH_QUERY_TEMPLATE.format(''))
 
 OUTPUT_DIR = Path(__file__).parent / "data" / "palanati_veera_charitra"
 
-# Request settings
-TIMEOUT = 60
-HEADERS = {
-    'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-}
+# One keep-alive session for all 33 posts on the same host; failed
+# requests are retried by its adapter, with exponential backoff
+SESSION = make_session(verify=True)
+# Posts fetched at once, and the least time between starting two requests
+FETCH_WORKERS = 4
+REQUEST_INTERVAL = 0.5
+
+# Post body candidates, in order of preference: the first matching div
+POST_BODY_XPATH = etree.XPath(f"(//div[{has_class('post-body')}])[1]")
+ENTRY_CONTENT_XPATH = etree.XPath(f"(//div[{has_class('entry-content')}])[1]")
+ARTICLE_BODY_XPATH = etree.XPath("(//div[@itemprop='articleBody'])[1]")
+# Heading candidates: divs (the post body included) whose style mentions
+# "center" in any case, in document order; CENTERED_STYLE_RE then checks
+# for text-align itself
+CENTER_STYLED_DIVS_XPATH = etree.XPath(
+    "descendant-or-self::div[contains(translate(@style, 'CENTER', 'center'), 'center')]"
+)
+
+# Patterns, compiled once
+EXCESS_NEWLINES_RE = re.compile(r'\n{3,}')
+# Section headings are centered divs with large/red text:
+# <div style="text-align: center;"><span ... style="color: red; font-size: x-large;">HEADING</span></div>
+CENTERED_STYLE_RE = re.compile(r'text-align:\s*center', re.IGNORECASE)
+TELUGU_CHAR_RE = re.compile('[\u0C00-\u0C7F]')
 
 
 def get_url_for_page(page_num: int) -> str:
     """Generate the URL for a specific page number."""
-    query = SEARCH_QUERY_TEMPLATE.format(page_num)
-    encoded_query = quote(query)
-    return BASE_URL + encoded_query
-
-
-def fetch_page(url: str, retries: int = 3) -> Optional[str]:
-    """Fetch HTML content from a URL."""
-    for attempt in range(retries):
-        try:
-            response = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            return response.text
-        except requests.RequestException as e:
-            print(f"  Attempt {attempt + 1}/{retries} failed: {e}")
-            if attempt < retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-    print(f"  ERROR: Failed to fetch {url} after {retries} attempts")
-    return None
+    return PAGE_URL_PREFIX + str(page_num)
+
+
+# Keeps the concurrent fetches polite to the blog host
+THROTTLE = RequestThrottle(REQUEST_INTERVAL)
 
 
 def clean_text(text: str) -> str:
     """Clean extracted text by removing extra whitespace."""
     # Remove multiple consecutive newlines (keep max 2)
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = EXCESS_NEWLINES_RE.sub('\n\n', text)
 
     # Remove leading/trailing whitespace from each line
     lines = [line.strip() for line in text.split('\n')]
 
-    # Remove empty lines at start and end
-    while lines and not lines[0]:
-        lines.pop(0)
-    while lines and not lines[-1]:
-        lines.pop()
+    # Remove empty lines at start and end (the lines are stripped, so only
+    # they can put newlines at either end of the text)
+    return '\n'.join(lines).strip('\n')
+
+
+def post_tokens(el, tokens: list, starts: dict, ends: dict, in_text: bool = True):
+    """Append the text nodes under an element to tokens, like the strings
+    bs4's get_text() joins once each <br> is replaced by a newline and a
+    newline is put before each <div>; record the token positions where each
+    element under el starts and ends.
+
+    Text inside NON_TEXT_TAGS is skipped, but the newlines for the <br>s and
+    <div>s in there are not.
+    """
+    if el.tag == 'br':
+        tokens.append('\n')
+    elif in_text and el.text:
+        tokens.append(text_node(el.text))
+    for child in el:
+        # Comments have a non-string tag; for them only the tail is text
+        if isinstance(child.tag, str):
+            starts[child] = len(tokens)
+            if child.tag == 'div':
+                tokens.append('\n')
+            post_tokens(child, tokens, starts, ends, in_text and child.tag not in NON_TEXT_TAGS)
+            ends[child] = len(tokens)
+        if in_text and child.tail:
+            tokens.append(text_node(child.tail))
+
+
+def is_heading_text(text: str) -> bool:
+    """Whether a heading candidate's text is a title: it must have Telugu
+    characters and reasonable length."""
+    return len(text) >= 2 and TELUGU_CHAR_RE.search(text) is not None
+
+
+def find_headings(post_body, starts: dict, ends: dict) -> List[Tuple[str, int, int]]:
+    """Find the section headings of a post body as (title, start, end)
+    tuples, in document order; start and end are token positions (see
+    post_tokens) of the heading's beginning and of the end of its text.
+
+    A heading is a centered div holding a span with only text in it (the
+    title), or an h2/h3 with only text in it. A centered div with such a
+    span runs up to the first </div> after the span, and no other centered
+    div inside that stretch is a heading, whether or not the span's text is a
+    title.
+    """
+    headings = []
+
+    # Find section headings - centered divs with large/red text
+    heading_end = 0
+    for div in CENTER_STYLED_DIVS_XPATH(post_body):
+        if starts[div] < heading_end or not CENTERED_STYLE_RE.search(div.get('style')):
+            continue
+        span = next((el for el in div.iter('span') if len(el) == 0 and el.text), None)
+        if span is None:
+            continue
+        # The heading ends with the first div to close after the span
+        heading_end = min(ends[el] for el in div.iter('div') if ends[el] >= ends[span])
+
+        heading_text = span.text.strip()
+        if is_heading_text(heading_text):
+            headings.append((heading_text, starts[div], heading_end))
+
+    # Also look for h2/h3 headings
+    seen = {h[0] for h in headings}
+    for header in post_body.iter('h2', 'h3'):
+        if len(header) or not header.text:
+            continue
+        heading_text = header.text.strip()
+        if is_heading_text(heading_text):
+            # Avoid duplicates
+            if heading_text not in seen:
+                seen.add(heading_text)
+                headings.append((heading_text, starts[header], ends[header]))
 
-    return '\n'.join(lines)
+    # Sort by position
+    headings.sort(key=lambda x: x[1])
+    return headings
 
 
 def extract_sections_from_post(post_body) -> List[Tuple[str, str]]:
@@ -87,44 +171,28 @@ def extract_sections_from_post(post_body) -> List[Tuple[str, str]]:
     - Maroon/purple text for verse content
     - Each verse line in a separate div
 
+    The text of the post body is gathered in one walk; a section's text is
+    what lies between the end of its heading and the next heading.
+
     Returns:
         List of (title, content) tuples
     """
     sections = []
-    content_html = str(post_body)
-
-    # Find section headings - centered divs with large/red text
-    # Pattern: <div style="text-align: center;"><span ... style="color: red; font-size: x-large;">HEADING</span></div>
-    heading_pattern = re.compile(
-        r'<div[^>]*text-align:\s*center[^>]*>.*?<span[^>]*>([^<]+)</span>.*?</div>',
-        re.IGNORECASE | re.DOTALL
-    )
-
-    headings = []
-    for match in heading_pattern.finditer(content_html):
-        heading_text = match.group(1).strip()
-        # Filter: must have Telugu characters and reasonable length
-        if len(heading_text) >= 2 and any('\u0C00' <= c <= '\u0C7F' for c in heading_text):
-            headings.append((heading_text, match.start(), match.end()))
-
-    # Also look for h2/h3 headings
-    for header_match in re.finditer(r'<h[23][^>]*>([^<]+)</h[23]>', content_html, re.IGNORECASE):
-        heading_text = header_match.group(1).strip()
-        if len(heading_text) >= 2 and any('\u0C00' <= c <= '\u0C7F' for c in heading_text):
-            # Avoid duplicates
-            if not any(h[0] == heading_text for h in headings):
-                headings.append((heading_text, header_match.start(), header_match.end()))
+    tokens = []
+    starts = {post_body: 0}
+    ends = {}
+    post_tokens(post_body, tokens, starts, ends)
+    ends[post_body] = len(tokens)
 
-    # Sort by position
-    headings.sort(key=lambda x: x[1])
+    headings = find_headings(post_body, starts, ends)
 
     if not headings:
         # No clear section headings, treat entire content as one section
-        text = extract_text_from_html(post_body)
+        text = clean_text(''.join(tokens))
         if text.strip():
-            # Try to extract first line as title
-            lines = [l for l in text.split('\n') if l.strip()]
-            title = lines[0][:50] if lines else "విభాగము"
+            # Try to extract first line as title; clean_text stripped every
+            # line and the blank ones at the start, so the first is not blank
+            title = text.partition('\n')[0][:50] or "విభాగము"
             return [(title, text)]
         return []
 
@@ -137,14 +205,9 @@ def extract_sections_from_post(post_body) -> List[Tuple[str, str]]:
         if i + 1 < len(headings):
             content_end = headings[i + 1][1]
         else:
-            content_end = len(content_html)
-
-        # Extract HTML chunk
-        section_html = content_html[content_start:content_end]
+            content_end = len(tokens)
 
-        # Parse and extract text
-        section_soup = BeautifulSoup(section_html, 'lxml')
-        content = extract_text_from_html(section_soup)
+        content = clean_text(''.join(tokens[content_start:content_end]))
 
         if content.strip():
             sections.append((title, content))
@@ -152,43 +215,19 @@ def extract_sections_from_post(post_body) -> List[Tuple[str, str]]:
     return sections
 
 
-def extract_text_from_html(soup) -> str:
-    """Extract clean text from HTML, preserving line breaks.
-
-    Handles the blog's structure where each verse line is in a separate div.
-    """
-    # Replace br tags with newlines
-    for br in soup.find_all('br'):
-        br.replace_with('\n')
-
-    # Replace divs with newlines (each div is typically a verse line)
-    for div in soup.find_all('div'):
-        # Add newline before div content
-        div.insert_before('\n')
-
-    text = soup.get_text()
-    return clean_text(text)
-
-
-def parse_blog_post(html: str, page_num: int) -> List[Tuple[str, str]]:
-    """Parse a blog post page and extract all sections.
+def parse_blog_post(tree, page_num: int) -> List[Tuple[str, str]]:
+    """Extract all sections from a parsed blog post page.
 
     Returns:
         List of (title, content) tuples
     """
-    soup = BeautifulSoup(html, 'lxml')
-
     # Find post body - try multiple selectors
-    post_body = soup.find('div', class_='post-body')
-    if not post_body:
-        post_body = soup.find('div', class_='entry-content')
-    if not post_body:
-        # Try to find any div with post content
-        post_body = soup.find('div', {'itemprop': 'articleBody'})
+    post_body = POST_BODY_XPATH(tree) or ENTRY_CONTENT_XPATH(tree) or ARTICLE_BODY_XPATH(tree)
 
     if not post_body:
         print(f"  WARNING: Could not find post body for page {page_num}")
         return []
+    post_body = post_body[0]
 
     # Extract sections
     sections = extract_sections_from_post(post_body)
@@ -196,17 +235,6 @@ def parse_blog_post(html: str, page_num: int) -> List[Tuple[str, str]]:
     return sections
 
 
-def sanitize_filename(name: str) -> str:
-    """Sanitize a string for use as a filename."""
-    # Remove or replace invalid filename characters
-    invalid_chars = r'[<>:"/\\|?*]'
-    sanitized = re.sub(invalid_chars, '', name)
-    # Replace multiple spaces with single space
-    sanitized = re.sub(r'\s+', ' ', sanitized)
-    # Limit length
-    return sanitized[:50].strip() if len(sanitized) > 50 else sanitized.strip()
-
-
 def format_output(page_num: int, section_num: int, title: str, content: str) -> str:
     """Format the section content for saving to file."""
     output = []
@@ -220,26 +248,35 @@ def format_output(page_num: int, section_num: int, title: str, content: str) ->
     return '\n'.join(output)
 
 
-def crawl_page(page_num: int, global_section_num: int) -> Tuple[int, int]:
-    """Crawl a single blog post page and save its sections.
+def fetch_post(page_num: int):
+    """Fetch a blog post page, parsing it as it downloads (see fetch_page).
+
+    Returns:
+        The root element of the page, or None if it could not be fetched
+    """
+    THROTTLE.wait()
+    return fetch_page(get_url_for_page(page_num), SESSION)
+
+
+def crawl_page(page_num: int, tree, global_section_num: int) -> Tuple[int, int]:
+    """Parse a single blog post page, already fetched, and save its sections.
 
     Args:
         page_num: The page number (1-33)
+        tree: The parsed page, or None if it could not be fetched
         global_section_num: Current global section counter
 
     Returns:
         Tuple of (sections_saved, new_global_section_num)
     """
-    url = get_url_for_page(page_num)
-    print(f"\n  Page {page_num:02d}: Fetching...")
+    print(f"\n  Page {page_num:02d}:")
 
-    html = fetch_page(url)
-    if not html:
+    if tree is None:
         print(f"    ERROR: Failed to fetch page {page_num}")
         return 0, global_section_num
 
     # Parse sections
-    sections = parse_blog_post(html, page_num)
+    sections = parse_blog_post(tree, page_num)
 
     if not sections:
         print(f"    WARNING: No sections found for page {page_num}")
@@ -257,8 +294,7 @@ def crawl_page(page_num: int, global_section_num: int) -> Tuple[int, int]:
         filepath = OUTPUT_DIR / filename
 
         # Save to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(output_text)
+        filepath.write_bytes(output_text.encode('utf-8'))
 
         print(f"    Section {global_section_num:03d}: {title[:40]}...")
         global_section_num += 1
@@ -284,12 +320,13 @@ def main():
     total_sections = 0
     global_section_num = 1
 
-    for page_num in range(1, TOTAL_PAGES + 1):
-        sections_saved, global_section_num = crawl_page(page_num, global_section_num)
-        total_sections += sections_saved
-
-        # Small delay between pages to be polite
-        time.sleep(1)
+    # Fetch posts concurrently (fetch_post waits on THROTTLE); pages are parsed
+    # and saved in order as they arrive, so section numbers stay sequential
+    page_nums = range(1, TOTAL_PAGES + 1)
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        for page_num, tree in zip(page_nums, pool.map(fetch_post, page_nums)):
+            sections_saved, global_section_num = crawl_page(page_num, tree, global_section_num)
+            total_sections += sections_saved
 
     # Final summary
     print("\n" + "=" * 60)
@@ -299,10 +336,9 @@ def main():
     print(f"Total sections saved: {total_sections}")
     print(f"Output directory: {OUTPUT_DIR}")
 
-    # Count files
-    if OUTPUT_DIR.exists():
-        file_count = len(list(OUTPUT_DIR.glob("*.txt")))
-        print(f"Files created: {file_count}")
+    # Count files (main created the directory); plain names, no Path per entry
+    file_count = sum(1 for name in os.listdir(OUTPUT_DIR) if name.endswith('.txt'))
+    print(f"Files created: {file_count}")
 
 
 if __name__ == "__main__":
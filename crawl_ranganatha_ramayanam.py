@@ -7,12 +7,22 @@ Downloads all 405 chapters across 7 kandas and saves them as organized .txt file
 
 import os
 import re
-import time
 import json
-import requests
-from bs4 import BeautifulSoup
+from lxml import etree
 from pathlib import Path
-from typing import Optional, Tuple, List, Dict
+from typing import Tuple, List, Dict
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+from crawl_common import (
+    INVALID_FILENAME_CHARS, NON_TEXT_TAGS, RequestThrottle, element_strings,
+    fetch_page, has_class, heading_title, make_session, text_node,
+)
 
 # Configuration
 BASE_URL = "https://www.andhrabharati.com/itihAsamulu/RanganathaRamayanamu/"
@@ -29,29 +39,39 @@ KANDAS = [
 
 OUTPUT_DIR = Path(__file__).parent / "data" / "ranganatha_ramayanam"
 CHECKPOINT_FILE = OUTPUT_DIR / "checkpoint.json"
+# Completed chapters between checkpoint saves; a kanda's end or an
+# interrupt saves too
+CHECKPOINT_EVERY = 10
 
 # Request settings
-REQUEST_DELAY = 1.5  # seconds between requests
-MAX_RETRIES = 3
+# Chapters fetched at once, and the least time between starting two
+# requests from any of them (the old one-at-a-time crawl waited as long
+# after each page, so the site sees no more requests than before)
+FETCH_WORKERS = 8
+REQUEST_INTERVAL = 1.5
 TIMEOUT = 30
 
+# Keeps the concurrent fetches polite to the site
+THROTTLE = RequestThrottle(REQUEST_INTERVAL)
+
+# One keep-alive session for every chapter on the same host (its pool holds
+# a connection per worker); failed requests are retried by its adapter, with
+# exponential backoff
+SESSION = make_session(verify=True)
 
-def fetch_page(url: str, retries: int = MAX_RETRIES) -> Optional[str]:
-    """Fetch HTML content from a URL with retry logic."""
-    for attempt in range(retries):
-        try:
-            response = requests.get(url, timeout=TIMEOUT)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            return response.text
-        except requests.RequestException as e:
-            print(f"  Attempt {attempt + 1}/{retries} failed for {url}: {e}")
-            if attempt < retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-    return None
+# Main content, chapter title and footnote list: the first matching div
+WMSECT_XPATH = etree.XPath(f"(//div[{has_class('wmsect')}])[1]")
+CHAPTER_HDR_XPATH = etree.XPath(f"(//div[{has_class('chapter_hdr')}])[1]")
+FNLIST_XPATH = etree.XPath(f"(//div[{has_class('fnlist')}])[1]")
+# Divs left out of the chapter text: navigation links, the footnote list
+# (read separately) and the chapter title
+SKIPPED_DIV_CLASSES = frozenset(['chapter_links', 'fnlist', 'chapter_hdr'])
 
+# Inline appendix markers [A], [B], etc., compiled once
+LETTER_MARKER_RE = re.compile(r'\[[A-Za-z]\]')
 
-def extract_footnotes(soup: BeautifulSoup) -> List[str]:
+
+def extract_footnotes(tree) -> List[str]:
     """Extract footnotes from the page.
 
     Returns:
@@ -60,10 +80,10 @@ def extract_footnotes(soup: BeautifulSoup) -> List[str]:
     footnotes = []
 
     # Find the fnlist div which contains footnotes
-    fnlist = soup.find('div', class_='fnlist')
+    fnlist = FNLIST_XPATH(tree)
     if fnlist:
         # Each footnote starts with ↑ symbol
-        fn_text = fnlist.get_text(separator='\n')
+        fn_text = '\n'.join(element_strings(fnlist[0]))
         for line in fn_text.split('\n'):
             line = line.strip()
             if line.startswith('↑'):
@@ -76,118 +96,116 @@ def extract_footnotes(soup: BeautifulSoup) -> List[str]:
     return footnotes
 
 
-def clean_text(text: str) -> str:
-    """Clean extracted text by removing extra whitespace."""
-    # Remove multiple consecutive newlines (keep max 2)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    # Remove leading/trailing whitespace from each line
-    lines = [line.strip() for line in text.split('\n')]
+def clean_content(text: str) -> str:
+    """Clean the text of a chapter's content div.
+
+    A single pass over the lines strips them, collapses runs of blank lines,
+    removes [A]-style markers and drops lines holding only a number
+    (footnote markers), with the same result as those steps done as separate
+    whole-text passes (with the blank lines collapsed before and after).
+    """
+    out = []
+    # A blank line came since the last non-blank one; one has come at all
+    blank = seen = False
+    # The last line kept, before stripping: a line left holding only spaces
+    # by a removed marker does not merge with the blank lines around it
+    last = None
+
+    for line in text.split('\n'):
+        line = line.strip()
+        if not line:
+            blank = True
+            continue
+        # Runs of blank lines between lines collapse to one
+        if blank and seen and last != '':
+            out.append('')
+            last = ''
+        blank = False
+        seen = True
+
+        # Remove inline [A], [B], etc. markers
+        if '[' in line:
+            line = LETTER_MARKER_RE.sub('', line)
+        stripped = line.strip()
+        # Skip lines that are just numbers (footnote markers)
+        if stripped.isdigit():
+            continue
+        if line or last != '':
+            out.append(stripped)
+            last = line
+
     # Remove empty lines at start and end
-    while lines and not lines[0]:
-        lines.pop(0)
-    while lines and not lines[-1]:
-        lines.pop()
-    return '\n'.join(lines)
+    return '\n'.join(out).strip('\n')
+
 
+def is_skipped(el) -> bool:
+    """Whether an element under the content div holds no chapter text:
+    scripts, styles, skipped divs, superscript footnote numbers and
+    footnote reference links."""
+    tag = el.tag
+    if tag == 'div':
+        classes = el.get('class')
+        return bool(classes) and not SKIPPED_DIV_CLASSES.isdisjoint(classes.split())
+    if tag == 'a':
+        return el.get('href', '').startswith('#fn_')
+    return tag in ('script', 'style', 'sup')
 
-def extract_content(html: str) -> Tuple[str, str, List[str]]:
-    """Extract main content and footnotes from HTML.
+
+def content_strings(el):
+    """Yield the text nodes under an element, like the strings bs4's get_text()
+    joins once each <br> is replaced by a newline and skipped elements are gone.
+
+    Other links keep their text, and the text around inline elements stays
+    together.
+    """
+    if el.tag == 'br':
+        yield '\n'
+    elif el.text:
+        yield text_node(el.text)
+    for child in el:
+        # For comments, skipped elements and NON_TEXT_TAGS only the tail is text
+        if isinstance(child.tag, str) and child.tag not in NON_TEXT_TAGS and not is_skipped(child):
+            yield from content_strings(child)
+        if child.tail:
+            yield text_node(child.tail)
+
+
+def extract_content(tree) -> Tuple[str, str, List[str]]:
+    """Extract main content and footnotes from a parsed page.
+
+    The page is read without modifying the tree; the parts left out of the
+    text are skipped as it is gathered.
 
     Returns:
         Tuple of (title, content, footnotes)
     """
-    soup = BeautifulSoup(html, 'lxml')
-
     # Extract title from chapter_hdr div
     title = ""
-    chapter_hdr = soup.find('div', class_='chapter_hdr')
+    chapter_hdr = CHAPTER_HDR_XPATH(tree)
     if chapter_hdr:
-        title = chapter_hdr.get_text(strip=True)
+        title = heading_title(chapter_hdr[0])
     else:
         # Fallback to title tag
-        title_tag = soup.find('title')
-        if title_tag:
-            title = title_tag.get_text(strip=True)
+        title_tag = tree.find('.//title')
+        if title_tag is not None:
+            title = heading_title(title_tag)
             # Clean up - remove site name
             if '-' in title:
                 title = title.split('-')[0].strip()
 
-    # Extract footnotes before modifying DOM
-    footnotes = extract_footnotes(soup)
+    footnotes = extract_footnotes(tree)
 
     # Find main content in wmsect div
-    wmsect = soup.find('div', class_='wmsect')
-    if not wmsect:
-        # Fallback to body if wmsect not found
-        wmsect = soup.find('body')
-
-    if wmsect:
-        # Remove elements we don't want
-        for tag in wmsect.find_all(['script', 'style']):
-            tag.decompose()
-
-        # Remove navigation links div
-        for nav in wmsect.find_all('div', class_='chapter_links'):
-            nav.decompose()
-
-        # Remove fnlist (footnotes - we already extracted them)
-        for fn in wmsect.find_all('div', class_='fnlist'):
-            fn.decompose()
-
-        # Remove chapter_hdr (we already got the title)
-        for hdr in wmsect.find_all('div', class_='chapter_hdr'):
-            hdr.decompose()
-
-        # Replace <br> tags with newline markers before text extraction
-        for br in wmsect.find_all('br'):
-            br.replace_with('\n')
-
-        # Remove superscript footnote numbers by unwrapping (keeps surrounding text together)
-        for sup in wmsect.find_all('sup'):
-            sup.decompose()
-
-        # Remove anchor tags but keep their non-footnote text
-        for a in wmsect.find_all('a'):
-            href = a.get('href', '')
-            # If it's a footnote reference, just remove it
-            if href.startswith('#fn_'):
-                a.decompose()
-            else:
-                # For other links, unwrap to keep text
-                a.unwrap()
+    wmsect = WMSECT_XPATH(tree)
+    # Fallback to body if wmsect not found
+    wmsect = wmsect[0] if wmsect else tree.find('body')
 
+    if wmsect is not None:
         # Get text content - don't use separator to avoid breaking text at inline elements
-        text = wmsect.get_text()
-
-        # Now normalize the whitespace while preserving intentional line breaks
-        # Split by newlines, strip each line, rejoin
-        lines = text.split('\n')
-        lines = [line.strip() for line in lines]
-        text = '\n'.join(lines)
+        text = clean_content(''.join(content_strings(wmsect)))
     else:
         text = ""
 
-    # Clean up the text
-    text = clean_text(text)
-
-    # Remove any remaining footnote/appendix markers
-    # Remove inline [A], [B], etc. markers
-    text = re.sub(r'\[[A-Za-z]\]', '', text)
-
-    # Remove standalone digit lines (footnote markers)
-    lines = text.split('\n')
-    cleaned_lines = []
-    for line in lines:
-        stripped = line.strip()
-        # Skip lines that are just numbers (footnote markers)
-        if stripped and stripped.isdigit():
-            continue
-        cleaned_lines.append(line)
-    text = '\n'.join(cleaned_lines)
-
-    # Clean up again after removing footnote markers
-    text = clean_text(text)
-
     return title, text, footnotes
 
 
@@ -215,8 +233,7 @@ def format_output(kanda_telugu: str, chapter_num: int, title: str, content: str,
 def sanitize_filename(name: str) -> str:
     """Sanitize a string for use as a filename."""
     # Remove or replace invalid filename characters
-    invalid_chars = r'[<>:"/\\|?*]'
-    sanitized = re.sub(invalid_chars, '', name)
+    sanitized = name.translate(INVALID_FILENAME_CHARS)
     # Limit length
     return sanitized[:50] if len(sanitized) > 50 else sanitized
 
@@ -224,34 +241,59 @@ def sanitize_filename(name: str) -> str:
 def load_checkpoint() -> Dict:
     """Load the checkpoint file to resume from where we left off."""
     if CHECKPOINT_FILE.exists():
+        if HAS_ORJSON:
+            return orjson.loads(CHECKPOINT_FILE.read_bytes())
         with open(CHECKPOINT_FILE, 'r', encoding='utf-8') as f:
             return json.load(f)
     return {"completed": []}
 
 
 def save_checkpoint(checkpoint: Dict):
-    """Save checkpoint to file."""
-    with open(CHECKPOINT_FILE, 'w', encoding='utf-8') as f:
-        json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    """Save checkpoint to file.
+
+    It is written to a temporary file that then replaces the old one, so a
+    crash while saving leaves the previous checkpoint intact.
+    """
+    tmp_file = CHECKPOINT_FILE.with_name(CHECKPOINT_FILE.name + '.tmp')
+    if HAS_ORJSON:
+        # Same bytes as json.dump(..., ensure_ascii=False, indent=2), encoded in C
+        tmp_file.write_bytes(orjson.dumps(checkpoint, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_file, CHECKPOINT_FILE)
+
+
+def chapter_url(kanda: Dict, chapter_num: int) -> str:
+    """URL of a chapter page."""
+    return f"{BASE_URL}RanganathaRamayanamu_{kanda['name']}_{chapter_num:03d}.html"
+
 
+def fetch_chapter(kanda: Dict, chapter_num: int):
+    """Fetch a chapter page, waiting for its turn under THROTTLE, and parse it
+    as it downloads (see fetch_page).
+
+    Returns:
+        The root element of the page, or None if it could not be fetched
+    """
+    THROTTLE.wait()
+    return fetch_page(chapter_url(kanda, chapter_num), SESSION, TIMEOUT)
 
-def crawl_chapter(kanda: Dict, chapter_num: int, output_folder: Path) -> bool:
-    """Crawl a single chapter and save it to a file.
+
+def crawl_chapter(kanda: Dict, chapter_num: int, output_folder: Path, tree) -> bool:
+    """Parse a single chapter, already fetched, and save it to a file.
 
     Returns:
         True if successful, False otherwise
     """
-    # Build URL
-    url = f"{BASE_URL}RanganathaRamayanamu_{kanda['name']}_{chapter_num:03d}.html"
+    url = chapter_url(kanda, chapter_num)
 
-    # Fetch the page
-    html = fetch_page(url)
-    if not html:
+    if tree is None:
         print(f"  ERROR: Failed to fetch {url}")
         return False
 
     # Extract content
-    title, content, footnotes = extract_content(html)
+    title, content, footnotes = extract_content(tree)
 
     if not content.strip():
         print(f"  WARNING: No content extracted from {url}")
@@ -290,27 +332,46 @@ def crawl_kanda(kanda: Dict, checkpoint: Dict) -> int:
     print(f"Chapters: {kanda['chapters']}")
     print(f"{'='*60}")
 
-    for chapter_num in range(1, kanda['chapters'] + 1):
-        chapter_id = f"{kanda['name']}_{chapter_num:03d}"
-
-        # Skip if already completed
-        if chapter_id in checkpoint.get('completed', []):
-            print(f"  Chapter {chapter_num:03d}: Already downloaded, skipping...")
-            success_count += 1
-            continue
-
-        print(f"  Chapter {chapter_num:03d}/{kanda['chapters']:03d}: Downloading...")
-
-        if crawl_chapter(kanda, chapter_num, output_folder):
-            success_count += 1
-            checkpoint['completed'].append(chapter_id)
+    chapter_nums = range(1, kanda['chapters'] + 1)
+    chapter_ids = [f"{kanda['name']}_{chapter_num:03d}" for chapter_num in chapter_nums]
+    # Chapters already downloaded; checkpoint['completed'] is a list, as saved
+    done = set(checkpoint.get('completed', []))
+    pending = [chapter_num for chapter_num, chapter_id in zip(chapter_nums, chapter_ids)
+               if chapter_id not in done]
+
+    # Fetch the missing chapters concurrently (throttled by fetch_chapter);
+    # they are parsed, saved and checkpointed in order as they arrive
+    pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS)
+    # Chapters completed since the last checkpoint save
+    unsaved = 0
+    try:
+        pages = pool.map(lambda chapter_num: fetch_chapter(kanda, chapter_num), pending)
+
+        for chapter_num, chapter_id in zip(chapter_nums, chapter_ids):
+            # Skip if already completed
+            if chapter_id in done:
+                print(f"  Chapter {chapter_num:03d}: Already downloaded, skipping...")
+                success_count += 1
+                continue
+
+            print(f"  Chapter {chapter_num:03d}/{kanda['chapters']:03d}: Downloading...")
+
+            if crawl_chapter(kanda, chapter_num, output_folder, next(pages)):
+                success_count += 1
+                checkpoint['completed'].append(chapter_id)
+                unsaved += 1
+                if unsaved >= CHECKPOINT_EVERY:
+                    save_checkpoint(checkpoint)
+                    unsaved = 0
+                print(f"  Chapter {chapter_num:03d}: Done")
+            else:
+                print(f"  Chapter {chapter_num:03d}: FAILED")
+    finally:
+        # On an interrupt, drop the fetches that have not started yet
+        pool.shutdown(cancel_futures=True)
+        # Save what is left, at the kanda's end or on an interrupt
+        if unsaved:
             save_checkpoint(checkpoint)
-            print(f"  Chapter {chapter_num:03d}: Done")
-        else:
-            print(f"  Chapter {chapter_num:03d}: FAILED")
-
-        # Rate limiting
-        time.sleep(REQUEST_DELAY)
 
     return success_count
 
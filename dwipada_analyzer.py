@@ -91,46 +91,46 @@ dependent_to_independent = {
     "ౄ": "ౠ", "ె": "ఎ", "ే": "ఏ", "ై": "ఐ", "ొ": "ఒ", "ో": "ఓ", "ౌ": "ఔ"
 }
 halant = "్"
-telugu_consonants = {
+telugu_consonants = frozenset({
     "క", "ఖ", "గ", "ఘ", "ఙ", "చ", "ఛ", "జ", "ఝ", "ఞ",
     "ట", "ఠ", "డ", "ఢ", "ణ", "త", "థ", "ద", "ధ", "న",
     "ప", "ఫ", "బ", "భ", "మ", "య", "ర", "ల", "వ", "శ",
     "ష", "స", "హ", "ళ", "ఱ"
-}
-long_vowels = {"ా", "ీ", "ూ", "ే", "ో", "ౌ", "ౄ"}
-independent_vowels = {
+})
+long_vowels = frozenset({"ా", "ీ", "ూ", "ే", "ో", "ౌ", "ౄ"})
+independent_vowels = frozenset({
     "అ", "ఆ", "ఇ", "ఈ", "ఉ", "ఊ", "ఋ", "ౠ",
     "ఎ", "ఏ", "ఐ", "ఒ", "ఓ", "ఔ"
-}
-independent_long_vowels = {"ఆ", "ఈ", "ఊ", "ౠ", "ఏ", "ఓ"}
-diacritics = {"ం", "ః"}
-dependent_vowels = set(dependent_to_independent.keys())
-ignorable_chars = {' ', '\n', 'ఁ', '​'}  # space, newline, arasunna, zero-width space
+})
+independent_long_vowels = frozenset({"ఆ", "ఈ", "ఊ", "ౠ", "ఏ", "ఓ"})
+diacritics = frozenset({"ం", "ః"})
+dependent_vowels = frozenset(dependent_to_independent)
+ignorable_chars = frozenset({' ', '\n', 'ఁ', '​'})  # space, newline, arasunna, zero-width space
 
 # Yati Maitri Groups (Vargas)
 # These groups define which letters can substitute for each other in Yati (యతి) matching
 # Letters in the same group are phonetically related and can satisfy Yati requirements
 YATI_MAITRI_GROUPS = [
-    {"అ", "ఆ", "ఐ", "ఔ", "హ", "య", "అం", "అః"},
-    {"ఇ", "ఈ", "ఎ", "ఏ", "ఋ"},
-    {"ఉ", "ఊ", "ఒ", "ఓ"},
-    {"క", "ఖ", "గ", "ఘ", "క్ష"},
-    {"చ", "ఛ", "జ", "ఝ", "శ", "ష", "స"},
-    {"ట", "ఠ", "డ", "ఢ"},
-    {"త", "థ", "ద", "ధ"},
-    {"ప", "ఫ", "బ", "భ", "వ"},
-    {"ర", "ల", "ఱ", "ళ"},
-    {"న", "ణ"},
-    {"మ", "పు", "ఫు", "బు", "భు", "ము"},
+    frozenset({"అ", "ఆ", "ఐ", "ఔ", "హ", "య", "అం", "అః"}),
+    frozenset({"ఇ", "ఈ", "ఎ", "ఏ", "ఋ"}),
+    frozenset({"ఉ", "ఊ", "ఒ", "ఓ"}),
+    frozenset({"క", "ఖ", "గ", "ఘ", "క్ష"}),
+    frozenset({"చ", "ఛ", "జ", "ఝ", "శ", "ష", "స"}),
+    frozenset({"ట", "ఠ", "డ", "ఢ"}),
+    frozenset({"త", "థ", "ద", "ధ"}),
+    frozenset({"ప", "ఫ", "బ", "భ", "వ"}),
+    frozenset({"ర", "ల", "ఱ", "ళ"}),
+    frozenset({"న", "ణ"}),
+    frozenset({"మ", "పు", "ఫు", "బు", "భు", "ము"}),
 ]
 
 # Svara Yati Groups (స్వర యతి) — Vowel family harmony
 # Vowels in the same group can satisfy Yati regardless of consonants.
 # Uses independent vowel forms; dependent vowels are mapped via dependent_to_independent.
 SVARA_YATI_GROUPS = [
-    {"అ", "ఆ", "ఐ", "ఔ"},
-    {"ఇ", "ఈ", "ఎ", "ఏ", "ఋ", "ౠ"},
-    {"ఉ", "ఊ", "ఒ", "ఓ"},
+    frozenset({"అ", "ఆ", "ఐ", "ఔ"}),
+    frozenset({"ఇ", "ఈ", "ఎ", "ఏ", "ఋ", "ౠ"}),
+    frozenset({"ఉ", "ఊ", "ఒ", "ఓ"}),
 ]
 
 # Bindu Yati (బిందు యతి) — Varga-to-Nasal mapping
@@ -143,11 +143,11 @@ VARGA_NASALS = {
     "ప": "మ", "ఫ": "మ", "బ": "మ", "భ": "మ",
 }
 NASAL_TO_VARGA = {
-    "ఙ": {"క", "ఖ", "గ", "ఘ"},
-    "ఞ": {"చ", "ఛ", "జ", "ఝ"},
-    "ణ": {"ట", "ఠ", "డ", "ఢ"},
-    "న": {"త", "థ", "ద", "ధ"},
-    "మ": {"ప", "ఫ", "బ", "భ"},
+    "ఙ": frozenset({"క", "ఖ", "గ", "ఘ"}),
+    "ఞ": frozenset({"చ", "ఛ", "జ", "ఝ"}),
+    "ణ": frozenset({"ట", "ఠ", "డ", "ఢ"}),
+    "న": frozenset({"త", "థ", "ద", "ధ"}),
+    "మ": frozenset({"ప", "ఫ", "బ", "భ"}),
 }
 
 # Prasa Equivalency Groups (ప్రాస సమానాక్షరములు)
@@ -155,9 +155,9 @@ NASAL_TO_VARGA = {
 # The equivalency applies regardless of gudinthams (vowel marks) or vattulu (conjuncts)
 # because get_base_consonant() extracts only the first consonant before comparison.
 PRASA_EQUIVALENTS = [
-    {"ల", "ళ"},
-    {"శ", "స"},
-    {"ఱ", "ర"},
+    frozenset({"ల", "ళ"}),
+    frozenset({"శ", "స"}),
+    frozenset({"ఱ", "ర"}),
 ]
 
 # =============================================================================
@@ -173,28 +173,41 @@ PRASA_EQUIVALENTS = [
 
 CONSONANT_VARGAS = {
     # Velar (కంఠ్యము) - produced at the soft palate (back of mouth)
-    "క-వర్గము (Velar)": ["క", "ఖ", "గ", "ఘ", "ఙ"],
+    "క-వర్గము (Velar)": ("క", "ఖ", "గ", "ఘ", "ఙ"),
 
     # Palatal (తాలవ్యము) - produced at the hard palate
     # Includes sibilants (శ, ష, స) which share palatal articulation
-    "చ-వర్గము (Palatal)": ["చ", "ఛ", "జ", "ఝ", "ఞ", "శ", "ష", "స"],
+    "చ-వర్గము (Palatal)": ("చ", "ఛ", "జ", "ఝ", "ఞ", "శ", "ష", "స"),
 
     # Retroflex (మూర్ధన్యము) - tongue curled back touching roof of mouth
-    "ట-వర్గము (Retroflex)": ["ట", "ఠ", "డ", "ఢ", "ణ"],
+    "ట-వర్గము (Retroflex)": ("ట", "ఠ", "డ", "ఢ", "ణ"),
 
     # Dental (దంత్యము) - tongue touches upper teeth
-    "త-వర్గము (Dental)": ["త", "థ", "ద", "ధ", "న"],
+    "త-వర్గము (Dental)": ("త", "థ", "ద", "ధ", "న"),
 
     # Labial (ఓష్ఠ్యము) - produced with lips
-    "ప-వర్గము (Labial)": ["ప", "ఫ", "బ", "భ", "మ"],
+    "ప-వర్గము (Labial)": ("ప", "ఫ", "బ", "భ", "మ"),
 
     # Semi-vowels and approximants (అంతస్థములు)
-    "య-వర్గము (Approximant)": ["య", "ర", "ల", "వ", "ళ", "ఱ"],
+    "య-వర్గము (Approximant)": ("య", "ర", "ల", "వ", "ళ", "ఱ"),
 
     # Aspirate (ఊష్మము)
-    "హ-వర్గము (Aspirate)": ["హ"],
+    "హ-వర్గము (Aspirate)": ("హ",),
 }
 
+# Reverse indexes, built once at import: letter → varga name, letter → indices
+# of the YATI_MAITRI_GROUPS holding it, and letter → members of those groups
+# (without duplicates, in order of first appearance)
+_LETTER_TO_VARGA = {c: name for name, cs in CONSONANT_VARGAS.items() for c in cs}
+_LETTER_TO_YATI_GROUPS: Dict[str, List[int]] = {}
+_LETTER_TO_MEMBERS: Dict[str, List[str]] = {}
+for _idx, _group in enumerate(YATI_MAITRI_GROUPS):
+    for _letter in _group:
+        _LETTER_TO_YATI_GROUPS.setdefault(_letter, []).append(_idx)
+        _LETTER_TO_MEMBERS.setdefault(_letter, []).extend(_group)
+for _letter, _members in _LETTER_TO_MEMBERS.items():
+    _LETTER_TO_MEMBERS[_letter] = list(dict.fromkeys(_members))
+
 # =============================================================================
 # SCORING CONSTANTS
 # =============================================================================
@@ -239,11 +252,7 @@ def get_consonant_varga(consonant: str) -> Optional[str]:
     if not consonant:
         return None
 
-    for varga_name, consonants in CONSONANT_VARGAS.items():
-        if consonant in consonants:
-            return varga_name
-
-    return None
+    return _LETTER_TO_VARGA.get(consonant)
 
 
 def get_letter_info(letter: str) -> Dict:
@@ -293,20 +302,9 @@ def get_letter_info(letter: str) -> Dict:
         result["type"] = "consonant"
         result["varga"] = get_consonant_varga(letter)
 
-    # Find Yati Maitri groups this letter belongs to
-    for idx, group in enumerate(YATI_MAITRI_GROUPS):
-        if letter in group:
-            result["yati_groups"].append(idx)
-            result["yati_group_members"].extend(list(group))
-
-    # Remove duplicates from group members while preserving order
-    seen = set()
-    unique_members = []
-    for member in result["yati_group_members"]:
-        if member not in seen:
-            seen.add(member)
-            unique_members.append(member)
-    result["yati_group_members"] = unique_members
+    # Find Yati Maitri groups this letter belongs to (copies, as callers own the result)
+    result["yati_groups"] = list(_LETTER_TO_YATI_GROUPS.get(letter, ()))
+    result["yati_group_members"] = list(_LETTER_TO_MEMBERS.get(letter, ()))
 
     return result
 
@@ -791,6 +789,35 @@ def categorize_aksharam(aksharam: str) -> List[str]:
     return sorted(list(categories))
 
 
+def _char_class(chars) -> str:
+    """Regex character class matching any of chars."""
+    return "[" + "".join(re.escape(c) for c in sorted(chars)) + "]"
+
+
+_CONSONANT_CLASS = _char_class(telugu_consonants)
+
+# Coarse aksharam scanner for pass 1 of split_aksharalu; the whole scan runs
+# in C instead of testing each character against the sets in Python.
+# Alternatives, tried in order:
+#   consonant cluster: C (halant C)* [halant] (dependent vowel | diacritic)*
+#   independent vowel with an optional diacritic
+#   any other single character (ignorables, stray signs, non-Telugu)
+_AKSHARAM_RE = re.compile(
+    _CONSONANT_CLASS + "(?:" + halant + _CONSONANT_CLASS + ")*" + halant + "?"
+    + _char_class(dependent_vowels | diacritics) + "*"
+    + "|" + _char_class(independent_vowels) + _char_class(diacritics) + "?"
+    + "|.",
+    re.DOTALL,
+)
+
+# Characters that make a syllable Guru on their own (akshara_ganavibhajana
+# rules 1-3): long vowel signs, ఐ/ఔ and their signs, anusvara and visarga
+_GURU_CHARS = frozenset("ఐఔైౌ") | long_vowels | diacritics
+
+# A consonant cluster anywhere in a syllable: C్C, conjunct or double
+_CLUSTER_RE = re.compile(_CONSONANT_CLASS + halant + _CONSONANT_CLASS)
+
+
 def split_aksharalu(word: str) -> List[str]:
     """
     Split Telugu word into aksharalu (syllables).
@@ -827,44 +854,7 @@ def split_aksharalu(word: str) -> List[str]:
     # ─────────────────────────────────────────────────────────────────────────
     # PASS 1: Coarse split - identify syllable boundaries
     # ─────────────────────────────────────────────────────────────────────────
-    coarse_split = []
-    i, n = 0, len(word)
-
-    while i < n:
-        # Skip ignorable characters (spaces, arasunna, etc.)
-        if word[i] in ignorable_chars:
-            coarse_split.append(word[i])
-            i += 1
-            continue
-
-        current = []
-        if word[i] in telugu_consonants:
-            # Start with consonant - collect entire consonant cluster
-            current.append(word[i])
-            i += 1
-            # Handle conjunct consonants: C్C్C... (halant chains)
-            while i < n and word[i] == halant:
-                current.append(word[i])  # Add halant
-                i += 1
-                if i < n and word[i] in telugu_consonants:
-                    current.append(word[i])  # Add next consonant in cluster
-                    i += 1
-                else:
-                    break  # Halant at end (pollu hallu case)
-            # Attach dependent vowels and diacritics (ా ి ం ః etc.)
-            while i < n and (word[i] in dependent_vowels or word[i] in diacritics):
-                current.append(word[i])
-                i += 1
-        else:
-            # Start with vowel (independent vowel like అ ఆ ఇ)
-            char = word[i]
-            current.append(char)
-            i += 1
-            # Independent vowel can have diacritics (అం అః)
-            if char in independent_vowels and i < n and word[i] in diacritics:
-                current.append(word[i])
-                i += 1
-        coarse_split.append("".join(current))
+    coarse_split = _AKSHARAM_RE.findall(word)
 
     if not coarse_split:
         return []
@@ -943,25 +933,16 @@ def akshara_ganavibhajana(aksharalu_list: List[str]) -> List[str]:
             ganam_markers[i] = ""
             continue
 
-        ganam_markers[i] = "I"  # Default: Laghu (light)
-        tags = set(categorize_aksharam(aksharam))
-
-        is_guru = False
-        # Rule 1: Long vowel (దీర్ఘ స్వరం)
-        if 'దీర్ఘ' in tags:
-            is_guru = True
+        # Rule 1: Long vowel (దీర్ఘ స్వరం) - a long vowel sign, or the
+        #         syllable is an independent long vowel
         # Rule 2: Diphthongs (సంధ్యక్షరం) - ఐ, ఔ
-        if 'ఐ' in aksharam or 'ఔ' in aksharam or 'ై' in aksharam or 'ౌ' in aksharam:
-            is_guru = True
         # Rule 3: Anusvara or Visarga
-        if 'అనుస్వారం' in tags or 'విసర్గ అక్షరం' in tags:
-            is_guru = True
         # Rule 4: Ends with halant (incomplete syllable)
-        if aksharam.endswith(halant):
-            is_guru = True
-
-        if is_guru:
-            ganam_markers[i] = "U"
+        # Otherwise Laghu (light)
+        is_guru = (aksharam.endswith(halant) or
+                   aksharam in independent_long_vowels or
+                   not _GURU_CHARS.isdisjoint(aksharam))
+        ganam_markers[i] = "U" if is_guru else "I"
 
     # ─────────────────────────────────────────────────────────────────────────
     # PASS 2: Sandhi rule - syllable before conjunct/double becomes Guru
@@ -970,24 +951,21 @@ def akshara_ganavibhajana(aksharalu_list: List[str]) -> List[str]:
     # cluster (conjunct or double), the CURRENT syllable becomes heavy.
     # Linguistic basis: The first consonant of the cluster "closes" the
     # previous syllable, making it a closed syllable (always Guru).
-    for i in range(len(aksharalu_list)):
+    #
+    # One reverse sweep tracks whether the next non-ignorable syllable has a
+    # consonant cluster (conjunct or double); a space is a word boundary,
+    # which the conjunct rule does not cross.
+    next_has_cluster = False
+    for i in range(len(aksharalu_list) - 1, -1, -1):
+        aksharam = aksharalu_list[i]
         if ganam_markers[i] == "":
+            if aksharam == ' ':
+                next_has_cluster = False
             continue
 
-        # Find next non-ignorable syllable — stop at word boundaries (spaces)
-        next_syllable_index = -1
-        for j in range(i + 1, len(aksharalu_list)):
-            if aksharalu_list[j] == ' ':
-                break  # Word boundary — conjunct rule does not cross words
-            if aksharalu_list[j] not in ignorable_chars:
-                next_syllable_index = j
-                break
-
-        if next_syllable_index != -1:
-            next_aksharam_tags = set(categorize_aksharam(aksharalu_list[next_syllable_index]))
-            # Check if next syllable starts with conjunct or double consonant
-            if 'సంయుక్తాక్షరం' in next_aksharam_tags or 'ద్విత్వాక్షరం' in next_aksharam_tags:
-                ganam_markers[i] = "U"  # Make current syllable Guru
+        if next_has_cluster:
+            ganam_markers[i] = "U"  # Make current syllable Guru
+        next_has_cluster = _CLUSTER_RE.search(aksharam) is not None
 
     return ganam_markers
 
@@ -1125,9 +1103,9 @@ def check_samyukta_yati(aksharam1: str, aksharam2: str) -> bool:
         for c2 in consonants2:
             if c1 == c2:
                 return True
-            for group in YATI_MAITRI_GROUPS:
-                if c1 in group and c2 in group:
-                    return True
+            groups2 = _LETTER_TO_YATI_GROUPS.get(c2, ())
+            if any(idx in groups2 for idx in _LETTER_TO_YATI_GROUPS.get(c1, ())):
+                return True
     return False
 
 
@@ -1217,12 +1195,14 @@ def check_yati_maitri(letter1: str, letter2: str) -> Tuple[bool, Optional[int],
         details["match_type"] = "exact"
         return True, -1, details
 
-    # Check for Yati Maitri group match (medium quality)
-    for idx, group in enumerate(YATI_MAITRI_GROUPS):
-        if letter1 in group and letter2 in group:
+    # Check for Yati Maitri group match (medium quality); the letters' group
+    # lists are in index order, so the first shared one is the lowest index
+    groups2 = _LETTER_TO_YATI_GROUPS.get(letter2, ())
+    for idx in _LETTER_TO_YATI_GROUPS.get(letter1, ()):
+        if idx in groups2:
             details["quality_score"] = YATI_VARGA_MATCH_SCORE
             details["match_type"] = "varga_match"
-            details["matching_group_members"] = list(group)
+            details["matching_group_members"] = list(YATI_MAITRI_GROUPS[idx])
             return True, idx, details
 
     # No match